@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Client for server.py, run by the filter in place of extract.py/command.py.
+
+    python3 client.py extract FILE MIME_SENSITIVE -- <uv command> server.py
+    python3 client.py uv -- <uv command> server.py
+
+The document text (or script header) is read from stdin and the response is
+written to stdout in the format extract.py/command.py use. The server for
+a given uv command and Quarto project is started on first use and found
+again through its socket afterwards; each request carries the directory
+it renders from. Only the standard library is
+imported, so the client starts in milliseconds.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+# Seconds to wait for a new server (uv may have to build its environment)
+START_TIMEOUT = 300.0
+
+
+def project_root() -> str:
+    # QUARTO_PROJECT_DIR if quarto set it, else the nearest directory with a
+    # _quarto.yml, so every directory of a project shares one server
+    root = os.environ.get("QUARTO_PROJECT_DIR")
+    if root:
+        return os.path.realpath(root)
+    cwd = os.path.realpath(os.getcwd())
+    folder = cwd
+    while True:
+        if any(os.path.exists(os.path.join(folder, name)) for name in ("_quarto.yml", "_quarto.yaml")):
+            return folder
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return cwd
+        folder = parent
+
+
+def runtime_dir() -> str:
+    # Without XDG_RUNTIME_DIR, a directory only this user can enter, so other
+    # users of a shared /tmp cannot take over or answer on the socket
+    folder = os.environ.get("XDG_RUNTIME_DIR")
+    if folder:
+        return folder
+    folder = os.path.join(tempfile.gettempdir(), f"quarto-marimo-{os.getuid()}")
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    info = os.lstat(folder)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) & 0o077
+    ):
+        raise PermissionError(f"{folder} is not a directory private to this user")
+    return folder
+
+
+def socket_path(start: list[str], root: str) -> str:
+    key = json.dumps([start, root]).encode()
+    return os.path.join(runtime_dir(), f"quarto-marimo-{hashlib.sha256(key).hexdigest()[:16]}.sock")
+
+
+def send(path: str, request: dict[str, Any]) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(path)
+        conn.sendall((json.dumps(request) + "\n").encode())
+        with conn.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def connect(start: list[str], root: str) -> str:
+    path = socket_path(start, root)
+    try:
+        send(path, {"command": "ping"})
+        return path
+    except (OSError, ValueError):
+        pass
+
+    with open(path + ".log", "ab") as log:  # the server keeps its own copy
+        subprocess.Popen(
+            [*start, "--socket", path],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,  # outlives this render
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            send(path, {"command": "ping"})
+            return path
+        except (OSError, ValueError):
+            time.sleep(0.05)
+    raise TimeoutError(f"marimo server did not start, see {path}.log")
+
+
+if __name__ == "__main__":
+    assert "--" in sys.argv, f"Unexpected call format got {sys.argv}"
+    split = sys.argv.index("--")
+    kind, *args = sys.argv[1:split]
+    start = sys.argv[split + 1 :]
+
+    text = sys.stdin.read()
+    root = project_root()
+    if kind == "extract":
+        reference_file, mime_sensitive = args
+        request = {
+            "command": "extract",
+            "text": text,
+            "reference_file": reference_file,
+            "mime_sensitive": mime_sensitive.lower(),
+            "cwd": os.getcwd(),
+            "root": root,
+            # Per-render settings (workers, cache, debug endpoint, version)
+            "env": {
+                key: value
+                for key, value in os.environ.items()
+                if key.startswith("QUARTO_MARIMO_")
+            },
+        }
+    else:
+        request = {"command": "uv", "header": text}
+
+    response = send(connect(start, root), request)
+    if "error" in response:
+        sys.stderr.write(f"marimo server: {response['error']}\n")
+        sys.exit(1)
+    sys.stdout.write(json.dumps(response["command"] if kind == "uv" else response))
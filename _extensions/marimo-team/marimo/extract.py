@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
+import ast
 import asyncio
+import hashlib
 import json
+import multiprocessing
 import os
 import re
 import sys
-from typing import Any, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 # Native to python
 from xml.etree.ElementTree import Element
@@ -47,25 +52,32 @@ default_config = {
 }
 
 
+# A `#| key: value` cell option, matched against a stripped line
+QUARTO_OPTION = re.compile(r"\#\|\s*(.*?)\s*:\s*(.*)")
+# Values common enough to skip the JSON decoder for
+OPTION_LITERALS: dict[str, Any] = {"true": True, "false": False}
+
+
 def extract_and_strip_quarto_config(block: str) -> tuple[dict[str, Any], str]:
-    pattern = r"^\s*\#\|\s*(.*?)\s*:\s*(.*?)(?=\n|\Z)"
     config: dict[str, Any] = {}
-    lines = block.split("\n")
-    if not lines:
-        return config, block
-
-    split_index = 0
-    for i, line in enumerate(lines):
-        split_index = i
-        line = line.strip()
-        if not line:
-            continue
-        source_match = re.search(pattern, line)
-        if not source_match:
+    # Walk the leading lines in place; the code is the rest of the block from
+    # the first non-option line (or the last line), as one slice.
+    start = 0
+    while True:
+        end = block.find("\n", start)
+        line = (block[start:] if end == -1 else block[start:end]).strip()
+        if line:
+            source_match = QUARTO_OPTION.match(line)
+            if not source_match:
+                break
+            key, value = source_match.groups()
+            config[key] = (
+                OPTION_LITERALS[value] if value in OPTION_LITERALS else json.loads(value)
+            )
+        if end == -1:
             break
-        key, value = source_match.groups()
-        config[key] = json.loads(value)
-    return config, "\n".join(lines[split_index:])
+        start = end + 1
+    return config, block[start:]
 
 
 def get_mime_render(
@@ -141,6 +153,313 @@ def app_config_from_root(root: Element) -> dict[str, Any]:
     return config
 
 
+def is_import_only(code: str) -> bool:
+    # Cells made only of imports are cheap and side-effect free enough to run once
+    # per group instead of tying every group that uses them together.
+    try:
+        body = ast.parse(code).body
+    except SyntaxError:
+        return False
+    return bool(body) and all(
+        isinstance(node, (ast.Import, ast.ImportFrom)) for node in body
+    )
+
+
+def independent_groups(app: MarimoIslandGenerator) -> list[list[int]]:
+    """Split the generator's cells into groups that can be built independently.
+
+    Cells are joined when one reads another's definitions, or when both define
+    the same name (so marimo still reports the redefinition). Import-only
+    cells are copied into every group that reads them. Returns indices into
+    the generator's cells, each group in cell order.
+
+    Only marimo variables are seen: cells coupled through side effects alone
+    (a file one writes and another reads, os.environ) land in separate groups.
+    The graph comes from marimo internals (`_app.graph`, `_stubs`, `_cell_id`),
+    so this is only used when `split_cells` opts in.
+    """
+    graph = app._app.graph
+    cell_ids = [stub._cell_id for stub in app._stubs]
+    position = {cell_id: i for i, cell_id in enumerate(cell_ids)}
+    imports = {
+        i for i, stub in enumerate(app._stubs) if is_import_only(stub.code)
+    }
+
+    parent = list(range(len(cell_ids)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    definers: dict[str, int] = {}
+    for i, cell_id in enumerate(cell_ids):
+        if i in imports:
+            continue
+        for upstream in graph.parents.get(cell_id, set()):
+            j = position[upstream]
+            if j not in imports:
+                parent[find(i)] = find(j)
+        for name in graph.cells[cell_id].defs:
+            if name in definers:
+                parent[find(i)] = find(definers[name])
+            definers.setdefault(name, i)
+
+    groups: dict[int, set[int]] = {}
+    for i in range(len(cell_ids)):
+        if i not in imports:
+            groups.setdefault(find(i), set()).add(i)
+    used: set[int] = set()
+    for members in groups.values():
+        needed = {
+            position[upstream]
+            for i in members
+            for upstream in graph.parents.get(cell_ids[i], set())
+        } & imports
+        members |= needed
+        used |= needed
+    for i in sorted(imports - used):
+        groups[i] = {i}
+    return sorted((sorted(members) for members in groups.values()), key=min)
+
+
+def is_error(stub: MarimoIslandStub) -> bool:
+    return stub.output is not None and stub.output.mimetype == "application/vnd.marimo+error"
+
+
+def render_group(
+    cells: list[tuple[str, dict[str, Any]]],
+    group: list[int],
+    global_options: dict[str, Any],
+    mime_sensitive: bool,
+) -> list[tuple[int, dict[str, Any], bool]]:
+    # Runs in a worker process. Every cell is added, so cell ids match the
+    # serial build, but only the group's cells carry code.
+    members = set(group)
+    app = MarimoIslandGenerator()
+    stubs = [
+        app.add_code(code if i in members else "", is_raw=True)
+        for i, (code, _) in enumerate(cells)
+    ]
+    _ = asyncio.run(app.build())
+    return [
+        (
+            i,
+            get_mime_render(global_options, stubs[i], cells[i][1], mime_sensitive),
+            is_error(stubs[i]),
+        )
+        for i in group
+    ]
+
+
+def split_cells() -> bool:
+    # QUARTO_MARIMO_SPLIT_CELLS=1: declare that the document's cells only share
+    # state through marimo variables. Builds then run only the cells they need
+    # (uncached cells and what they read) and, with QUARTO_MARIMO_WORKERS, run
+    # unrelated groups of cells in separate processes. Cells that depend on
+    # each other's side effects (files written then read, os.environ, module
+    # state) would run out of order or not at all, so unset, every cell runs in
+    # one kernel, in document order, whenever any output has to be rebuilt.
+    return os.environ.get("QUARTO_MARIMO_SPLIT_CELLS", "") not in ("", "0")
+
+
+def render_workers() -> int:
+    # QUARTO_MARIMO_WORKERS: worker processes for building independent cell
+    # groups concurrently ("auto" for one per CPU), with QUARTO_MARIMO_SPLIT_CELLS.
+    # Unset or 1 builds serially.
+    workers = os.environ.get("QUARTO_MARIMO_WORKERS", "1")
+    if workers == "auto":
+        return os.cpu_count() or 1
+    return max(int(workers), 1)
+
+
+class OutputCache:
+    """Rendered cell outputs on disk, addressed by `cell_cache_keys`."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, output: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(output))
+        tmp.replace(path)
+
+
+def output_cache() -> Optional[OutputCache]:
+    # QUARTO_MARIMO_CACHE: directory for cached cell outputs, e.g.
+    # .quarto/marimo-cache. Unset (or empty) re-executes every cell; set, the
+    # document runs only when some output is not cached.
+    # Outputs are invalidated by the files `cell_cache_keys` can see; data a
+    # cell reaches any other way (paths built at runtime, environment
+    # variables, databases) must be listed in its `file-deps` option.
+    directory = os.environ.get("QUARTO_MARIMO_CACHE", "")
+    return OutputCache(directory) if directory else None
+
+
+def referenced_files(code: str) -> set[str]:
+    # String literals that name an existing file or directory, e.g. the
+    # parquet a cell reads.
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return set()
+    paths = set()
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, str)
+            and 0 < len(node.value) < 1024
+            and "\n" not in node.value
+            and ("/" in node.value or "." in node.value.strip("./"))
+            and os.path.exists(node.value)
+        ):
+            paths.add(node.value)
+    return paths
+
+
+def file_fingerprint(path: str) -> list[Any]:
+    # mtime and size of a file, or of every file under a directory
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return [path, stat.st_mtime_ns, stat.st_size]
+    entries: list[Any] = [path]
+    for folder, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            stat = os.stat(os.path.join(folder, name))
+            entries.append([os.path.join(folder, name), stat.st_mtime_ns, stat.st_size])
+    return entries
+
+
+def local_module_files(code: str, seen: Optional[set[str]] = None) -> set[str]:
+    # Source files of the modules a cell imports from the working directory
+    # (e.g. utils.py, tools/), and of the local modules those import in turn.
+    seen = set() if seen is None else seen
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return seen
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names |= {alias.name.split(".")[0] for alias in node.names}
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    for name in sorted(names):
+        if os.path.isfile(f"{name}.py"):
+            sources = [f"{name}.py"]
+        elif os.path.isfile(os.path.join(name, "__init__.py")):
+            sources = sorted(
+                os.path.join(folder, file)
+                for folder, dirs, files in os.walk(name)
+                if "__pycache__" not in folder
+                for file in files
+                if file.endswith(".py")
+            )
+        else:
+            continue
+        for source in sources:
+            if source not in seen:
+                seen.add(source)
+                local_module_files(Path(source).read_text(), seen)
+    return seen
+
+
+def config_files(paths: Iterable[str]) -> set[str]:
+    # Existing paths named by the values of referenced JSON/TOML/YAML config
+    # files, e.g. the `data.nexus_path` a cell reads through config.yaml.
+    found: set[str] = set()
+    for path in paths:
+        suffix = Path(path).suffix.lower()
+        if not os.path.isfile(path) or suffix not in {".json", ".toml", ".yaml", ".yml"}:
+            continue
+        try:
+            text = Path(path).read_text()
+            if suffix == ".json":
+                data = json.loads(text)
+            elif suffix == ".toml":
+                import tomllib
+
+                data = tomllib.loads(text)
+            else:
+                import yaml
+
+                data = yaml.safe_load(text)
+        except Exception:
+            continue
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, str) and "\n" not in value and os.path.exists(value):
+                found.add(value)
+    return found
+
+
+def cell_cache_keys(
+    app: MarimoIslandGenerator,
+    configs: list[dict[str, Any]],
+    global_options: dict[str, Any],
+    mime_sensitive: bool,
+) -> list[str]:
+    """Content address of each of the generator's cells' rendered output.
+
+    A key covers the cell's code, id and options, the code of every cell
+    upstream of it, and the mtime and size of the files those cells depend
+    on: files named in string literals or listed in a `file-deps` option,
+    paths found in those that are config files, and the sources of local
+    modules the cells import. Editing prose changes none of these.
+    """
+    graph = app._app.graph
+    position = {stub._cell_id: i for i, stub in enumerate(app._stubs)}
+    # Files each cell's code depends on, resolved once per build
+    dependencies: dict[str, set[str]] = {}
+    keys = []
+    for stub, config in zip(app._stubs, configs):
+        upstream = [
+            app._stubs[i].code
+            for i in sorted(position[cell_id] for cell_id in graph.ancestors(stub._cell_id))
+        ]
+        files = set(config.get("file-deps", []))
+        for code in [stub.code, *upstream]:
+            if code not in dependencies:
+                dependencies[code] = referenced_files(code) | local_module_files(code)
+            files |= dependencies[code]
+        files |= config_files(files)
+        payload = {
+            "extract": __version__,
+            "marimo": marimo.__version__,
+            "cell_id": stub._cell_id,
+            "code": stub.code,
+            "upstream": upstream,
+            "config": config,
+            "global_options": global_options,
+            "mime_sensitive": mime_sensitive,
+            "files": [file_fingerprint(path) for path in sorted(files)],
+        }
+        keys.append(
+            hashlib.sha256(
+                json.dumps(payload, sort_keys=True, default=str).encode()
+            ).hexdigest()
+        )
+    return keys
+
+
 def build_export_with_mime_context(
     mime_sensitive: bool,
 ) -> Callable[[Element], SafeWrap]:
@@ -186,7 +505,85 @@ def build_export_with_mime_context(
         if has_attrs and global_options.get("warning", True):
             pass
 
-        _ = asyncio.run(app.build())
+        # Position in `stubs` of each cell added to the generator
+        added = [i for i, (_, stub) in enumerate(stubs) if stub is not None]
+        outputs: list[Optional[dict[str, Any]]] = [None] * len(stubs)
+
+        def emit(i: int, output: dict[str, Any]) -> None:
+            outputs[i] = output
+
+        for i, (config, stub) in enumerate(stubs):
+            if stub is None:
+                emit(i, get_mime_render(global_options, stub, config, mime_sensitive))
+
+        # Indices (into `added`) of the cells still to render
+        pending = set(range(len(added)))
+        cache = output_cache()
+        keys: list[str] = []
+        if cache is not None:
+            configs = [stubs[i][0] for i in added]
+            keys = cell_cache_keys(app, configs, global_options, mime_sensitive)
+            for j, key in enumerate(keys):
+                cached = cache.get(key)
+                if cached is not None:
+                    emit(added[j], cached)
+                    pending.discard(j)
+
+        def rendered(j: int, output: dict[str, Any], failed: bool) -> None:
+            if j in pending and outputs[added[j]] is None:  # shared import cells
+                emit(added[j], output)
+                if cache is not None and not failed:  # errors are retried next time
+                    cache.put(keys[j], output)
+
+        split = split_cells() and (cache is not None or render_workers() > 1)
+        if pending and not split:
+            # The whole notebook in one kernel, so side effects happen in order
+            _ = asyncio.run(app.build())
+            for j in sorted(pending):
+                config, stub = stubs[added[j]]
+                rendered(
+                    j,
+                    get_mime_render(global_options, stub, config, mime_sensitive),
+                    is_error(stub),  # type: ignore[arg-type]
+                )
+        elif pending:
+            # Only the groups holding uncached cells run, and only those cells
+            # and what they read (see `split_cells`)
+            graph = app._app.graph
+            cell_ids = [stub._cell_id for stub in app._stubs]
+            position = {cell_id: j for j, cell_id in enumerate(cell_ids)}
+            needed = set(pending)
+            for j in pending:
+                needed |= {position[cell_id] for cell_id in graph.ancestors(cell_ids[j])}
+            runs = [
+                sorted(needed & set(group))
+                for group in independent_groups(app)
+                if pending & set(group)
+            ]
+            workers = min(render_workers(), len(runs))
+            cells = [(stubs[i][1].code, stubs[i][0]) for i in added]  # type: ignore[union-attr]
+            if workers > 1:
+                # Each group runs in its own kernel; outputs are emitted as groups finish
+                # Spawned: this may run inside the long-lived server, whose
+                # threads a forked child would inherit mid-operation
+                with ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context("spawn")
+                ) as pool:
+                    futures = [
+                        pool.submit(
+                            render_group, cells, run, global_options, mime_sensitive
+                        )
+                        for run in runs
+                    ]
+                    for future in as_completed(futures):
+                        for j, output, failed in future.result():
+                            rendered(j, output, failed)
+            else:
+                for j, output, failed in render_group(
+                    cells, sorted(needed), global_options, mime_sensitive
+                ):
+                    rendered(j, output, failed)
+
         dev_server = os.environ.get("QUARTO_MARIMO_DEBUG_ENDPOINT", False)
         version_override = os.environ.get("QUARTO_MARIMO_VERSION", marimo.__version__)
         header = app.render_head(
@@ -196,10 +593,7 @@ def build_export_with_mime_context(
         return SafeWrap(
             {
                 "header": header,
-                "outputs": [
-                    get_mime_render(global_options, stub, config, mime_sensitive)
-                    for config, stub in stubs
-                ],
+                "outputs": outputs,
                 "count": len(stubs),
             }  # type: ignore[arg-type]
         )
@@ -219,17 +613,75 @@ class MarimoPandocParser(MarimoParser):
     }
 
 
+# One parser per output format, reset and reused for every document converted
+# in this process.
+_parsers: dict[str, MarimoPandocParser] = {}
+
+
+def pandoc_parser(mime_sensitive: bool) -> MarimoPandocParser:
+    output_format = (
+        "marimo-pandoc-export-with-mime" if mime_sensitive else "marimo-pandoc-export"
+    )
+    parser = _parsers.get(output_format)
+    if parser is None:
+        parser = _parsers[output_format] = MarimoPandocParser(output_format=output_format)  # type: ignore[arg-type]
+        return parser
+    # Not Markdown.reset(): superfences would swap in a new code stash while
+    # marimo's processors keep the old one, so clear the stashes in place.
+    parser.htmlStash.reset()
+    parser.references.clear()
+    for processor in [*parser.preprocessors, *parser.parser.blockprocessors]:
+        stash = getattr(processor, "stash", None)
+        if isinstance(stash, dict):
+            stash.clear()
+    parser.meta = {}  # frontmatter is merged into it
+    return parser
+
+
 def convert_from_md_to_pandoc_export(text: str, mime_sensitive: bool) -> dict[str, Any]:
     if not text:
         return {"header": "", "outputs": []}
-    if mime_sensitive:
-        parser = MarimoPandocParser(output_format="marimo-pandoc-export-with-mime")  # type: ignore[arg-type]
-    else:
-        parser = MarimoPandocParser(output_format="marimo-pandoc-export")  # type: ignore[arg-type]
-    return parser.convert(text)  # type: ignore[arg-type, return-value]
+    return pandoc_parser(mime_sensitive).convert(text)  # type: ignore[arg-type, return-value]
+
+
+def convert_batch(requests: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Convert many documents in this process, one result per request.
+
+    A request holds the document `text` (or a `reference_file` to read it
+    from), `mime_sensitive`, and optionally an `id` echoed in its result.
+    Parsers, marimo and the modules cells import are loaded once for all of
+    them. A failed document yields an `error` result instead of stopping the
+    batch.
+    """
+    for request in requests:
+        result: dict[str, Any] = {"id": request.get("id")}
+        try:
+            text = request.get("text")
+            if not text:
+                with open(request["reference_file"]) as f:
+                    text = f.read()
+            no_js = bool(request.get("mime_sensitive", False))
+            os.environ["MARIMO_NO_JS"] = str(no_js).lower()
+            result.update(convert_from_md_to_pandoc_export(text, no_js))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        yield result
+
+
+def write_line(value: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(value) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--worker"]:
+        # Long-lived worker: one JSON request per stdin line (see
+        # convert_batch), one JSON result per stdout line.
+        requests = (json.loads(line) for line in sys.stdin if line.strip())
+        for result in convert_batch(requests):
+            write_line(result)
+        sys.exit(0)
+
     assert len(sys.argv) == 3, f"Unexpected call format got {sys.argv}"
     _, reference_file, mime_sensitive = sys.argv
 
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Long-lived extraction server for the marimo filter.
+
+Started (by client.py) as `<uv command> server.py --socket PATH`, it keeps
+marimo and the cells' imports loaded in one environment and answers
+extract.py and command.py requests over a Unix socket, so rendering many
+documents pays interpreter start, `import marimo` and uv resolution once.
+
+Each extraction runs with the server's startup environment plus the request's
+QUARTO_MARIMO_* variables, in the request's working directory. One server
+serves a whole project: local modules the cells import (files under the
+request's project root, e.g. utils.py) are dropped from sys.modules when one
+of them changes on disk or a render runs in another directory, so edits are
+picked up on the next render; installed packages stay loaded for the
+server's lifetime.
+
+Protocol: one JSON request line per connection, one JSON response line.
+- {"command": "extract", "text", "reference_file", "mime_sensitive", "cwd", "root", "env"}
+  -> the extract.py conversion
+- {"command": "uv", "header"} -> the command.py uv arguments
+- {"command": "ping"} / {"command": "shutdown"}
+Failures answer {"error": "..."}.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+from typing import Any
+
+from command import extract_command
+from extract import convert_batch
+
+# Seconds without a request before the server exits
+IDLE_TIMEOUT = float(os.environ.get("QUARTO_MARIMO_DAEMON_IDLE", "900"))
+
+# Environment the server started with, minus the starting render's settings;
+# each request's QUARTO_MARIMO_* variables are applied on top
+BASE_ENVIRON = {
+    key: value
+    for key, value in os.environ.items()
+    if not key.startswith("QUARTO_MARIMO_")
+}
+
+# The extension's own modules (this server among them) are never reloaded
+EXTENSION_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "")
+
+# uv arguments by script header; resolving them writes a temporary file and
+# reads the project's configuration, so each header is resolved once.
+_uv_commands: dict[str, list[str]] = {}
+
+# Modification times of the local modules loaded by earlier renders
+_local_mtimes: dict[str, int | None] = {}
+
+# Directory of the previous render
+_last_cwd: str | None = None
+
+
+def local_modules(root: str) -> dict[str, str]:
+    """Loaded modules defined by files under `root`, by name."""
+    root = os.path.join(os.path.realpath(root), "")
+    found = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if not path or "site-packages" in path:
+            continue
+        path = os.path.realpath(path)
+        if path.startswith(root) and not path.startswith(EXTENSION_DIR):
+            found[name] = path
+    return found
+
+
+def drop_changed_modules(root: str, moved: bool = False) -> None:
+    """Unload every local module if any of their files changed since the last render.
+
+    With `moved`, the render runs in another directory than the last one, whose
+    modules may share names with this one's, so they are unloaded regardless.
+    """
+    modules = local_modules(root)
+    changed = moved
+    for path in modules.values():
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        changed = changed or _local_mtimes.get(path, mtime) != mtime
+    if changed:
+        # All of them: unchanged modules may hold references to the changed ones
+        for name in modules:
+            sys.modules.pop(name, None)
+        _local_mtimes.clear()
+
+
+def remember_modules(root: str) -> None:
+    for path in local_modules(root).values():
+        try:
+            _local_mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+
+
+def handle(request: dict[str, Any]) -> dict[str, Any]:
+    kind = request.get("command")
+    if kind == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    if kind == "shutdown":
+        return {"ok": True, "shutdown": True}
+    if kind == "uv":
+        header = request.get("header", "")
+        if header not in _uv_commands:
+            _uv_commands[header] = extract_command(header)
+        return {"command": _uv_commands[header]}
+    if kind == "extract":
+        global _last_cwd
+        # Documents resolve relative paths from where quarto runs the filter;
+        # one server covers every directory of the project under `root`
+        cwd = request.get("cwd") or os.getcwd()
+        root = request.get("root") or cwd
+        os.chdir(cwd)
+        # Variables set for an earlier render must not leak into this one
+        os.environ.clear()
+        os.environ.update(BASE_ENVIRON)
+        os.environ.update(request.get("env") or {})
+        drop_changed_modules(root, moved=_last_cwd not in (None, cwd))
+        _last_cwd = cwd
+        (result,) = convert_batch([{
+            "text": request.get("text", ""),
+            "reference_file": request.get("reference_file"),
+            "mime_sensitive": request.get("mime_sensitive") == "yes",
+        }])
+        remember_modules(root)
+        result.pop("id", None)
+        return result
+    return {"error": f"Unknown command {kind!r}"}
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            response = handle(json.loads(self.rfile.readline()))
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        self.wfile.write((json.dumps(response) + "\n").encode())
+        if response.get("shutdown"):
+            self.server.stopping = True  # type: ignore[attr-defined]
+
+
+class Server(socketserver.UnixStreamServer):
+    # Requests are handled one at a time: conversions chdir and set
+    # environment variables for the document being rendered.
+    stopping = False
+    timeout = IDLE_TIMEOUT
+
+    def handle_timeout(self) -> None:
+        self.stopping = True
+
+
+def is_live(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def serve(path: str) -> None:
+    if os.path.exists(path):
+        if is_live(path):
+            return  # another server won the race
+        os.unlink(path)  # left behind by a server that died
+    with Server(path, Handler) as server:
+        os.chmod(path, 0o600)
+        try:
+            while not server.stopping:
+                server.handle_request()
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    assert len(sys.argv) == 3 and sys.argv[1] == "--socket", (
+        f"Unexpected call format got {sys.argv}"
+    )
+    serve(sys.argv[2])
@@ -50,8 +50,36 @@ local function extract_text(para)
     return text
 end
 
+-- Set QUARTO_MARIMO_DAEMON to route requests through a long-lived server
+-- (server.py) that keeps marimo loaded between documents and renders.
+local function use_daemon()
+    local daemon = os.getenv("QUARTO_MARIMO_DAEMON")
+    return daemon ~= nil and daemon ~= "" and daemon ~= "0"
+end
+
+-- Run a server.py request through client.py, which starts the server with
+-- `command` and `args` if it is not already running.
+local function daemon_pipe(request_args, command, args, text)
+    local client_script = file_dir .. "client.py"
+    return pandoc.pipe(
+        os.getenv("QUARTO_MARIMO_PYTHON") or "python3",
+        concat_lists({ client_script }, request_args, { "--", command }, args),
+        text
+    )
+end
+
 -- Construct the full UV command given:
 function _construct_uv_command(header)
+    if use_daemon() then
+        return pandoc.json.decode(
+            daemon_pipe(
+                { "uv" },
+                "uv",
+                { "run", "--with", "marimo", file_dir .. "server.py" },
+                header
+            )
+        )
+    end
     local command_script = file_dir .. "command.py"
     return pandoc.json.decode(
         pandoc.pipe(
@@ -64,6 +92,9 @@ end
 
 function run_marimo(meta)
     local endpoint_script = file_dir .. "extract.py"
+    if use_daemon() then
+        endpoint_script = file_dir .. "server.py"
+    end
 
     -- PDFs / LaTeX have to be handled specifically for mimetypes
     -- Need to pass in a string as arg in python invocation.
@@ -105,10 +136,21 @@ function run_marimo(meta)
             text = text or ""
 
             -- Parse the input file using the external Python script
-            default_args = { filename, mime_sensitive }
-            result = pandoc.json.decode(
-                pandoc.pipe(command, concat_lists(args, default_args), text)
-            )
+            if use_daemon() then
+                result = pandoc.json.decode(
+                    daemon_pipe(
+                        { "extract", filename, mime_sensitive },
+                        command,
+                        args,
+                        text
+                    )
+                )
+            else
+                default_args = { filename, mime_sensitive }
+                result = pandoc.json.decode(
+                    pandoc.pipe(command, concat_lists(args, default_args), text)
+                )
+            end
             -- Concatenate the result arrays
             for _, item in ipairs(result["outputs"]) do
                 table.insert(parsed_data, item)
@@ -0,0 +1,77 @@
+"""Benchmark the Polars and DuckDB backends on the same tools/utils calls.
+
+Usage: python -m benchmarks.backends [path/to/nexus.parquet] [--repeat N] [--memory-limit 4GB]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+import polars as pl
+import yaml
+
+import tools
+import utils
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def workloads(backend: tools.Backend, nexus: Any, config: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """The calls to time, by name, bound to one backend's nexus handle."""
+    query = config["query"]
+    geo = utils.GeographyIndex.from_sub_region_info(backend.get_sub_region_info(nexus))
+    return {
+        "datamap": lambda: backend.datamap(
+            nexus, query["source_metadata_columns"], query["indicator_metadata_columns"]
+        ),
+        "filter_pivot (label)": lambda: backend.filter_pivot(nexus, query["index_columns"], "label"),
+        "filter_pivot (code)": lambda: backend.filter_pivot(nexus, query["index_columns"], "code"),
+        "calculate_base_stats": lambda: backend.calculate_base_stats(nexus),
+        "get_sub_region_info": lambda: backend.get_sub_region_info(nexus),
+        "calculate_sub_region_coverage": lambda: backend.calculate_sub_region_coverage(nexus, geo),
+        "create_indicators_metadata": lambda: backend.create_indicators_metadata(nexus, geo),
+    }
+
+
+def main() -> None:
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default=config["data"]["nexus_path"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--memory-limit", default=None, help="DuckDB memory limit, e.g. 4GB; beyond it DuckDB spills")
+    args = parser.parse_args()
+    config["data"]["nexus_path"] = args.path
+
+    timings: Dict[str, Dict[str, float]] = {}
+    for name in tools.available_backends():
+        backend = tools.get_backend(name)
+        if name == "duckdb":
+            from tools import duckdb_backend
+
+            con = duckdb_backend.connect(memory_limit=args.memory_limit)  # kept alive for the relation
+            nexus = backend.load_nexus(config, con=con)
+        else:
+            pl.enable_string_cache()   # as the notebook setup does
+            nexus = backend.load_nexus(config)
+        for workload, fn in workloads(backend, nexus, config).items():
+            timings.setdefault(workload, {})[name] = best_time(fn, args.repeat)
+
+    names = tools.available_backends()
+    print(f"{'':<32}" + "".join(f"{name + ' (s)':>14}" for name in names) + f"{'faster':>10}")
+    for workload, by_backend in timings.items():
+        fastest = min(by_backend, key=by_backend.get)
+        print(f"{workload:<32}" + "".join(f"{by_backend[name]:>14.3f}" for name in names) + f"{fastest:>10}")
+
+
+if __name__ == "__main__":
+    main()
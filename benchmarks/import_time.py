@@ -0,0 +1,74 @@
+"""Check the startup cost of importing the tools package and utils against a budget.
+
+Usage: python -m benchmarks.import_time [--budget-ms 50] [--repeat 5]
+
+Each import runs in a fresh interpreter, after `import polars` (which every tool needs), so
+the time reported is what the repo adds on top. Exits non-zero if an import goes over the
+budget or loads one of the heavy optional dependencies.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_MS = 50.0
+
+IMPORTS = [
+    "import tools",
+    "from tools import datamap",
+    "import utils",
+]
+
+# Only the functions that use them may import these
+HEAVY_MODULES = ["altair", "marimo", "pandas", "pyarrow", "numpy", "duckdb"]
+
+_PROBE = """
+import json, sys, time
+import polars
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(statement: str, repeat: int) -> Dict:
+    """Best time in ms over `repeat` fresh interpreters, and the heavy modules loaded."""
+    runs: List[Dict] = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        runs.append(json.loads(out))
+    return {"ms": min(run["ms"] for run in runs), "heavy": runs[0]["heavy"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'import':<28}{'ms over polars':>16}  heavy modules")
+    for statement in IMPORTS:
+        result = measure(statement, args.repeat)
+        over = result["ms"] > args.budget_ms or result["heavy"]
+        failed = failed or bool(over)
+        print(
+            f"{statement:<28}{result['ms']:>16.1f}  {', '.join(result['heavy']) or '-'}"
+            f"{'  OVER BUDGET' if over else ''}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark create_indicators_metadata: three separate collects vs one fused group-by.
+
+Usage: python -m benchmarks.indicators_metadata [path/to/nexus.parquet] [--repeat N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import polars as pl
+import yaml
+
+import utils
+
+
+def count_scans(plans: List[str]) -> int:
+    """Count the scan nodes in the given optimized plans."""
+    return sum(plan.count("SCAN") for plan in plans)
+
+
+def separate_collects(df: pl.LazyFrame) -> pl.DataFrame:
+    """The original notebook implementation: one collect (and one scan) per aggregation."""
+    sub_region_info = utils.get_sub_region_info(df)
+    base_stats = utils.calculate_base_stats(df)
+    coverage = utils.calculate_sub_region_coverage(df, sub_region_info)
+    return base_stats.join(coverage, on="indicator_label", how="left")
+
+
+def best_time(fn: Callable[[pl.LazyFrame], pl.DataFrame], df: pl.LazyFrame, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default=config["data"]["nexus_path"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pl.scan_parquet(Path(args.path)).rename({"country_or_area": "country"})
+
+    before_scans = count_scans([
+        utils.sub_region_info_plan(df).explain(),
+        utils.base_stats_plan(df).explain(),
+        utils.sub_region_counts_plan(df.filter(pl.col("value").is_not_null())).explain(),
+    ])
+    after_scans = count_scans([utils.indicators_metadata_plan(df).explain()])
+
+    before = best_time(separate_collects, df, args.repeat)
+    after = best_time(utils.create_indicators_metadata, df, args.repeat)
+
+    print(f"{'':<20}{'scans':>8}{'wall time (s)':>16}")
+    print(f"{'separate collects':<20}{before_scans:>8}{before:>16.3f}")
+    print(f"{'fused group-by':<20}{after_scans:>8}{after:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
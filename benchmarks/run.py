@@ -0,0 +1,163 @@
+"""Run the tools/utils benchmark suite on synthetic nexus data and save the results as JSON.
+
+Usage: python -m benchmarks.run [--rows 1000000 10000000 100000000] [--workloads NAME ...]
+                                [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import polars as pl
+import yaml
+
+from .synthetic import generate_nexus
+
+DATA_DIR = Path(".cache") / "synthetic"
+RESULTS_DIR = Path("benchmarks") / "results"
+DEFAULT_ROWS = [1_000_000, 10_000_000, 100_000_000]
+
+
+def workloads(config: Dict[str, Any]) -> Dict[str, Callable[[pl.LazyFrame], Any]]:
+    """The benchmarked calls, by name, each taking the loaded nexus LazyFrame."""
+    import tools
+    import utils
+
+    query = config["query"]
+
+    def sub_region_coverage(nexus: pl.LazyFrame) -> pl.DataFrame:
+        return utils.calculate_sub_region_coverage(nexus, utils.get_sub_region_info(nexus))
+
+    return {
+        "datamap": lambda nexus: tools.datamap(
+            nexus, query["source_metadata_columns"], query["indicator_metadata_columns"]
+        ),
+        "filter_pivot": lambda nexus: tools.filter_pivot(nexus, query["index_columns"]),
+        "calculate_base_stats": utils.calculate_base_stats,
+        "calculate_sub_region_coverage": sub_region_coverage,
+        "create_indicators_metadata": utils.create_indicators_metadata,
+    }
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_worker(workload: str, path: Path) -> Dict[str, Any]:
+    """Time one workload in this process. Called in a fresh subprocess, so peak RSS is its own."""
+    import tools
+
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+    config["data"]["nexus_path"] = str(path)
+    pl.enable_string_cache()   # as the notebook setup does
+    nexus = tools.load_nexus(config)
+    fn = workloads(config)[workload]
+
+    rss_before = peak_rss_bytes()
+    start = time.perf_counter()
+    fn(nexus)
+    wall = time.perf_counter() - start
+    return {"wall_s": wall, "peak_rss_bytes": peak_rss_bytes(), "rss_before_bytes": rss_before}
+
+
+def run_workload(workload: str, path: Path, rows: int) -> Dict[str, Any]:
+    """Run one workload in a subprocess and collect its measurements."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", workload, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return {"workload": workload, "rows": rows, **result, "rows_per_s": rows / result["wall_s"]}
+
+
+def dataset(rows: int) -> Path:
+    """Synthetic parquet of `rows` rows, generated once and reused by later runs."""
+    path = DATA_DIR / f"nexus_{rows}.parquet"
+    if not path.exists():
+        print(f"generating {path} ...", file=sys.stderr)
+        generate_nexus(path, rows)
+    return path
+
+
+def environment() -> Dict[str, Any]:
+    """What the numbers depend on besides the code: versions, machine and commit."""
+    commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "platform": platform.platform(),
+        "cpus": pl.thread_pool_size(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path) -> None:
+    """Print wall time and peak RSS ratios against a previous results file."""
+    baseline = {
+        (entry["workload"], entry["rows"]): entry
+        for entry in json.loads(baseline_path.read_text())["results"]
+    }
+    print(f"{'workload':<32}{'rows':>12}{'time x':>10}{'rss x':>10}")
+    for entry in results:
+        before = baseline.get((entry["workload"], entry["rows"]))
+        if before is None:
+            continue
+        print(
+            f"{entry['workload']:<32}{entry['rows']:>12}"
+            f"{entry['wall_s'] / before['wall_s']:>10.2f}"
+            f"{entry['peak_rss_bytes'] / before['peak_rss_bytes']:>10.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--workloads", nargs="+", default=list(workloads(config)))
+    parser.add_argument("--output", type=Path, default=None, help="defaults to benchmarks/results/<timestamp>.json")
+    parser.add_argument("--compare", type=Path, default=None, help="a previous results file")
+    parser.add_argument("--worker", nargs=2, metavar=("WORKLOAD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker[0], Path(args.worker[1]))))
+        return
+
+    results = []
+    for rows in args.rows:
+        path = dataset(rows)
+        for workload in args.workloads:
+            entry = run_workload(workload, path, rows)
+            results.append(entry)
+            print(
+                f"{workload:<32}{rows:>12}{entry['wall_s']:>10.3f} s"
+                f"{entry['peak_rss_bytes'] / 1024**2:>10.0f} MiB{entry['rows_per_s']:>14,.0f} rows/s"
+            )
+
+    run = {"environment": environment(), "results": results}
+    output = args.output or RESULTS_DIR / f"{run['environment']['timestamp'].replace(':', '')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2))
+    print(f"saved {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
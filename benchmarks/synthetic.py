@@ -0,0 +1,262 @@
+"""Generate synthetic nexus-shaped parquet data for benchmarks.
+
+Usage: python -m benchmarks.synthetic OUT.parquet [--rows N] [--countries N] [--indicators N] [--seed N]
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+# Country membership flags: the column and the value a member country has in it
+MEMBERSHIP_COLUMNS = {
+    "least_developed_countries_ldc": "LDC",
+    "land_locked_developing_countries_lldc": "LLDC",
+    "small_island_developing_states_sids": "SIDS",
+    "arab_states": "Arab States",
+    "fragile_and_conflict_affected_situations": "FCS",
+    "hipc": "HIPC",
+    "oecd_member": "OECD",
+    "small_state": "Small State",
+    "ldc_transit_countries": "LDC Transit",
+    "oil_exporting_countries": "Oil Exporter",
+}
+INCOME_COLUMNS = {
+    "high_income": "High income",
+    "upper_middle_income": "Upper middle income",
+    "lower_middle_income": "Lower middle income",
+    "low_income": "Low income",
+}
+# Column order of the processed nexus.parquet
+NEXUS_COLUMNS = [
+    "year", "value", "source", "indicator_code", "indicator_label", "database", "collection", "value_meta",
+    "global_code", "global_name", "region_code", "region_name", "sub_region_code", "sub_region_name",
+    "intermediate_region_code", "intermediate_region_name", "country_or_area", "m49", "iso2", "iso3",
+    "least_developed_countries_ldc", "land_locked_developing_countries_lldc",
+    "small_island_developing_states_sids", "arab_states", "fragile_and_conflict_affected_situations",
+    "hipc", "high_income", "low_income", "lower_middle_income", "oecd_member", "small_state",
+    "ldc_transit_countries", "upper_middle_income", "oil_exporting_countries",
+]
+
+
+def country_table(
+    countries: int,
+    regions: int,
+    sub_regions: int,
+    membership_rate: float,
+    rng: np.random.Generator
+) -> pl.DataFrame:
+    """One row per synthetic country with its M49 geography and classification columns."""
+    sub_region = rng.integers(0, sub_regions, countries)
+    region = sub_region % regions
+    income = rng.integers(0, len(INCOME_COLUMNS) + 1, countries)   # the extra level: unclassified
+    has_intermediate = rng.random(countries) < 0.3
+
+    return pl.DataFrame({
+        "global_code": np.ones(countries),
+        "global_name": ["World"] * countries,
+        "region_code": (region + 1).astype(float) * 100,
+        "region_name": [f"Region {r}" for r in region],
+        "sub_region_code": (sub_region + 1).astype(float) * 10,
+        "sub_region_name": [f"Sub Region {s}" for s in sub_region],
+        "intermediate_region_code": np.where(has_intermediate, sub_region + 1000.0, np.nan),
+        "intermediate_region_name": [
+            f"Intermediate Region {s}" if flag else None for s, flag in zip(sub_region, has_intermediate)
+        ],
+        "country_or_area": [f"Country {i}" for i in range(countries)],
+        "m49": np.arange(countries, dtype=float) + 1,
+        "iso2": [f"{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}" for i in range(countries)],
+        "iso3": [f"{chr(65 + i // 676 % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}" for i in range(countries)],
+        **{
+            column: [member if flag else None for flag in rng.random(countries) < membership_rate]
+            for column, member in MEMBERSHIP_COLUMNS.items()
+        },
+        **{
+            column: [label if flag else None for flag in income == level]
+            for level, (column, label) in enumerate(INCOME_COLUMNS.items())
+        },
+    }).with_columns(pl.col("intermediate_region_code").fill_nan(None))
+
+
+def indicator_table(indicators: int, sources: int, collections: int, rng: np.random.Generator) -> pl.DataFrame:
+    """One row per synthetic indicator with its source metadata and a value scale."""
+    source = np.arange(indicators) % sources
+    collection = rng.integers(0, collections, indicators)
+    return pl.DataFrame({
+        "source": [f"Source {s}" for s in source],
+        "database": [f"Source {s} database" for s in source],
+        "collection": [f"Source {s} collection {c}" for s, c in zip(source, collection)],
+        "indicator_code": [f"S{s}.IND.{i:05d}" for s, i in zip(source, range(indicators))],
+        "indicator_label": [f"Indicator {i} (source {s})" for s, i in zip(source, range(indicators))],
+        "value_meta": [["units", "percent", "index", None][k] for k in rng.integers(0, 4, indicators)],
+        "scale": 10.0 ** rng.integers(-2, 7, indicators),
+    })
+
+
+def permute(ids: np.ndarray, size: int, keys: np.ndarray) -> np.ndarray:
+    """
+    Images of `ids` under a pseudo-random permutation of range(size), chosen by `keys`.
+
+    A Feistel network over the smallest even number of bits covering `size`, re-applied
+    to the images that land past it (cycle walking), so distinct ids map to distinct ids.
+    """
+    half = max(((size - 1).bit_length() + 1) // 2, 1)
+    mask = np.uint64((1 << half) - 1)
+    out = ids.astype(np.uint64)
+    walk = np.ones(len(out), dtype=bool)
+    while walk.any():
+        left, right = out[walk] >> np.uint64(half), out[walk] & mask
+        for key in keys:
+            mixed = ((right ^ key) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(64 - half)
+            left, right = right, left ^ mixed
+        out[walk] = (left << np.uint64(half)) | right
+        walk = out >= size
+    return out
+
+
+def generate_nexus(
+    path: Union[str, Path],
+    rows: int,
+    countries: int = 250,
+    indicators: Optional[int] = None,
+    sources: int = 6,
+    collections: int = 4,
+    regions: int = 5,
+    sub_regions: int = 17,
+    years: Tuple[int, int] = (1960, 2024),
+    value_null_rate: float = 0.1,
+    country_null_rate: float = 0.02,
+    membership_rate: float = 0.3,
+    chunk_rows: int = 1_000_000,
+    seed: int = 0
+) -> Path:
+    """
+    Write `rows` rows of synthetic data in the processed nexus.parquet layout.
+
+    Rows are generated and written `chunk_rows` at a time, so memory stays flat whatever
+    the size. Each row is a distinct (indicator, country, year) cell, drawn at random without
+    replacement, so pivots do not depend on row order; country attributes come from a fixed
+    country table, as in the real data.
+
+    Parameters
+    ----------
+    path
+        Output parquet file.
+    rows
+        Number of rows to write.
+    countries, indicators, sources, collections, regions, sub_regions
+        Cardinalities. `collections` is per source. `indicators` defaults to 2,000, or as
+        many as it takes for the rows to fill at most half of the cells.
+    years
+        Inclusive year range.
+    value_null_rate
+        Share of rows with a null `value`.
+    country_null_rate
+        Share of rows with no country (aggregates in the real data).
+    membership_rate
+        Share of countries in each membership group (LDC, SIDS, OECD, ...).
+    chunk_rows
+        Rows per generated chunk, written as one row group.
+    seed
+        Random seed; the same arguments always produce the same file.
+
+    Returns
+    -------
+    Path
+        The written file.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer distinct cells than `rows`.
+    """
+    import pyarrow.parquet as pq
+
+    n_years = years[1] - years[0] + 1
+    if indicators is None:
+        indicators = max(2_000, -(-2 * rows // (countries * n_years)))
+    # Cells with a country, and cells without one (one per indicator and year)
+    cells = indicators * countries * n_years
+    null_cells = indicators * n_years
+    null_rows = min(round(rows * country_null_rate), null_cells)
+    if rows - null_rows > cells:
+        raise ValueError(f"{rows} rows do not fit in {cells + null_cells} distinct (indicator, country, year) cells")
+
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 2**63, (2, 4), dtype=np.uint64)
+    country_dim = country_table(countries, regions, sub_regions, membership_rate, rng).with_row_index("country_id")
+    indicator_dim = indicator_table(indicators, sources, collections, rng).with_row_index("indicator_id")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    writer = None
+    try:
+        # rows=0 still writes one (empty) chunk, so the file has the schema
+        for start in range(0, max(rows, 1), chunk_rows):
+            end = min(start + chunk_rows, rows)
+            # The chunk's share of the rows without a country, spread evenly over the file
+            null_start, null_end = null_rows * start // max(rows, 1), null_rows * end // max(rows, 1)
+            cell = permute(np.arange(start - null_start, end - null_end), cells, keys[0])
+            null_cell = permute(np.arange(null_start, null_end), null_cells, keys[1])
+            n = end - start
+            chunk = (
+                pl.concat([
+                    pl.DataFrame({
+                        "indicator_id": (cell // n_years // countries).astype(np.uint32),
+                        "country_id": (cell // n_years % countries).astype(np.uint32),
+                        "year": (cell % n_years).astype(np.int64) + years[0],
+                    }),
+                    pl.DataFrame({
+                        "indicator_id": (null_cell // n_years).astype(np.uint32),
+                        "country_id": pl.Series([None] * len(null_cell), dtype=pl.UInt32),
+                        "year": (null_cell % n_years).astype(np.int64) + years[0],
+                    }),
+                ])
+                .sample(fraction=1.0, shuffle=True, seed=int(rng.integers(2**32)))
+                .with_columns(
+                    value=rng.standard_normal(n),
+                    missing=rng.random(n) < value_null_rate,
+                )
+                .join(indicator_dim, on="indicator_id", how="left")
+                .join(country_dim, on="country_id", how="left")
+                .with_columns(
+                    pl.when(~pl.col("missing")).then(pl.col("value") * pl.col("scale")).alias("value")
+                )
+                .select(NEXUS_COLUMNS)
+                .to_arrow()
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, chunk.schema, compression="zstd")
+            writer.write_table(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    tmp.replace(path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--countries", type=int, default=250)
+    parser.add_argument("--indicators", type=int, default=None)   # sized to the rows by generate_nexus
+    parser.add_argument("--value-null-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(generate_nexus(
+        args.path,
+        args.rows,
+        countries=args.countries,
+        indicators=args.indicators,
+        value_null_rate=args.value_null_rate,
+        seed=args.seed
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,6 @@ app = marimo.App(width="columns")
 
 @app.cell(column=0)
 def _():
-    import pandas as pd
     import altair as alt
     import marimo as mo
     from pathlib import Path
@@ -17,21 +16,6 @@ def _():
     return Path, alt, mo, nx, pl, yaml
 
 
-@app.cell(hide_code=True)
-def _(mo):
-    mo.md(r"""## Force reload tools""")
-    return
-
-
-@app.cell
-def _(nx):
-    import importlib
-    importlib.reload(nx)
-    print(nx.__file__)
-    print(dir(nx))
-    return
-
-
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""## Setup""")
@@ -45,7 +29,7 @@ def _(mo):
 
 
 @app.cell
-def _(Path, alt, yaml):
+def _(Path, alt, nx, pl, yaml):
     # 1. Load configuration
     with open("config.yaml") as f:
         config = yaml.safe_load(f)
@@ -62,7 +46,25 @@ def _(Path, alt, yaml):
 
     # 4. Altair transformer
     alt.data_transformers.enable('default', max_rows=None)
-    return COUNTRY_CLASSES, DATA_PATH, INDEX_COLS, IND_META, SOURCE_META
+
+    # 5. Result cache keyed by the nexus parquet fingerprint
+    CACHE = nx.ResultCache.from_config(config, PROJECT_ROOT)
+
+    # 6. Opt-in profiling of tools/utils calls (config.yaml `profiling`, or NEXUS_PROFILE=1)
+    nx.configure_profiling(config, PROJECT_ROOT)
+
+    # 7. Global string cache, so the categorical columns of separate loads and collects join
+    pl.enable_string_cache()
+    return (
+        CACHE,
+        COUNTRY_CLASSES,
+        DATA_PATH,
+        INDEX_COLS,
+        IND_META,
+        PROJECT_ROOT,
+        SOURCE_META,
+        config,
+    )
 
 
 @app.cell
@@ -73,30 +75,14 @@ def _(mo):
 
 @app.cell(hide_code=True)
 def _(mo):
-    mo.md(r"""Nexus table with income level categorical + "country" rename""")
-    return
-
-
-@app.cell
-def _(DATA_PATH, pl):
-    # 1️⃣ Lazy‑load the Parquet into a LazyFrame
-    nexus = (
-        pl.scan_parquet(DATA_PATH)
-        .rename({"country_or_area": "country"})
-        .with_columns(
-            pl.when(pl.col("high_income") == "High income")
-            .then(pl.lit("High Income"))
-            .when(pl.col("upper_middle_income") == "Upper middle income")
-            .then(pl.lit("Upper Middle Income"))
-            .when(pl.col("lower_middle_income") == "Lower middle income")
-            .then(pl.lit("Lower Middle Income"))
-            .when(pl.col("low_income") == "Low income")
-            .then(pl.lit("Low Income"))
-            .otherwise(None)
-            .cast(pl.Categorical)
-            .alias("income_level")
-        )
-    )
+    mo.md(r"""Nexus table with income level enum, categorical strings + "country" rename""")
+    return
+
+
+@app.cell
+def _(PROJECT_ROOT, config, nx):
+    # 1️⃣ Lazy‑load the Parquet into a LazyFrame with dictionary-encoded strings
+    nexus = nx.load_nexus(config, PROJECT_ROOT)
     return (nexus,)
 
 
@@ -315,14 +301,20 @@ def _(mo):
 @app.cell
 def _():
     from utils import (
+        calculate_coverage,
+        geography_index,
         get_sub_region_info,
         calculate_base_stats,
         calculate_sub_region_coverage,
+        create_indicators_metadata,
         style_sub_region_coverage_heatmap
     )
     return (
         calculate_base_stats,
+        calculate_coverage,
         calculate_sub_region_coverage,
+        create_indicators_metadata,
+        geography_index,
         get_sub_region_info,
         style_sub_region_coverage_heatmap,
     )
@@ -335,8 +327,22 @@ def _(mo):
 
 
 @app.cell
-def _(get_sub_region_info, nexus):
-    get_sub_region_info(nexus)
+def _(DATA_PATH, config, geography_index, nexus, nx):
+    # Built once per version of the parquet, reused by every coverage call
+    geo = geography_index(nexus, version=nx.parquet_fingerprint(DATA_PATH))
+    # Indicator x country x year presence bitmaps, stored next to the parquet
+    presence = nx.PresenceIndex.open(
+        nexus, DATA_PATH, country_dim_path=config["data"].get("country_dim_path")
+    )
+    return (
+        geo,
+        presence,
+    )
+
+
+@app.cell
+def _(geo, get_sub_region_info, nexus):
+    get_sub_region_info(nexus, geo)
     return
 
 
@@ -347,8 +353,8 @@ def _(mo):
 
 
 @app.cell
-def _(calculate_base_stats, nexus):
-    calculate_base_stats(nexus)
+def _(CACHE, calculate_base_stats, nexus, presence):
+    CACHE(calculate_base_stats, nexus, presence)
     return
 
 
@@ -359,10 +365,12 @@ def _(mo):
 
 
 @app.cell
-def _(calculate_sub_region_coverage, get_sub_region_info, nexus):
-    cvg_geo=calculate_sub_region_coverage(
+def _(CACHE, calculate_sub_region_coverage, geo, nexus, presence):
+    cvg_geo=CACHE(
+        calculate_sub_region_coverage,
         nexus,
-        get_sub_region_info(nexus)
+        geo,
+        presence
     )
 
     cvg_geo
@@ -377,7 +385,19 @@ def _(mo):
 
 @app.cell
 def _(cvg_geo, style_sub_region_coverage_heatmap):
-    style_sub_region_coverage_heatmap(cvg_geo)
+    style_sub_region_coverage_heatmap(cvg_geo, vectorized=True)
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""Coverage by every country classification""")
+    return
+
+
+@app.cell
+def _(CACHE, COUNTRY_CLASSES, calculate_coverage, nexus):
+    CACHE(calculate_coverage, nexus, COUNTRY_CLASSES)
     return
 
 
@@ -388,78 +408,8 @@ def _(mo):
 
 
 @app.cell
-def _(
-    calculate_base_stats,
-    calculate_sub_region_coverage,
-    get_sub_region_info,
-    nexus,
-    pl,
-):
-    """Nexus indicators metadata analysis tool."""
-
-    # import polars as pl
-    # from utils import (
-    #    get_sub_region_info,
-    #    calculate_base_stats,
-    #    calculate_sub_region_coverage
-    # )
-
-
-    def create_indicators_metadata(df: pl.LazyFrame) -> pl.DataFrame:
-       """
-       Create comprehensive metadata table for indicators in nexus dataset.
-   
-       Parameters
-       ----------
-       df : pl.LazyFrame
-           LazyFrame containing nexus data
-       
-       Returns
-       -------
-       pl.DataFrame
-           Metadata table with one row per indicator
-       """
-   
-       def calculate_temporal_completeness() -> pl.Expr:
-           """Calculate temporal completeness expression."""
-           return (
-               pl.col("num_years_with_data") / (pl.col("max_year") - pl.col("min_year") + 1) * 100
-           ).fill_null(0)
-
-       def calculate_geographic_completeness(sub_region_info: pl.DataFrame) -> pl.Expr:
-           """Calculate geographic completeness expression."""
-           regions = sub_region_info.get_column("sub_region_name").to_list()
-       
-           return pl.concat_list([
-               pl.col(f"pct_coverage_{region.replace(' ', '_')}") for region in regions
-           ]).list.mean()
-   
-       # Get sub-region information
-       sub_region_info = get_sub_region_info(df)
-   
-       # Calculate base statistics
-       base_stats = calculate_base_stats(df)
-   
-       # Calculate sub-region coverage percentages (returns raw DataFrame, not styled)
-       sub_region_coverage=calculate_sub_region_coverage(nexus, sub_region_info)
-   
-       # Calculate completeness components
-       temporal_completeness = calculate_temporal_completeness()
-       geographic_completeness = calculate_geographic_completeness(sub_region_info)
-
-       # Calculate final metrics with completeness score
-       final_result = (
-           base_stats
-           .join(sub_region_coverage, on="indicator_label", how="left")
-           .with_columns([
-               ((temporal_completeness + geographic_completeness) / 2).alias("completeness_score")
-           ])
-           .sort("completeness_score", descending=True)
-       )
-   
-       return final_result
-
-    create_indicators_metadata(nexus)
+def _(CACHE, create_indicators_metadata, geo, nexus, presence):
+    CACHE(create_indicators_metadata, nexus, geo, presence)
     return
 
 
@@ -581,6 +531,42 @@ def _(INDEX_COLS, nexus, nx, pl):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""Several filtered pivots from one scan""")
+    return
+
+
+@app.cell
+def _(INDEX_COLS, nexus, nx, pl):
+    pivots = nx.filter_pivot_many(
+        nexus,
+        {
+            "ISORA 2020": (pl.col("source") == "ISORA") & (pl.col("year") == 2020),
+            "World Bank, Africa": (pl.col("source") == "World Bank") & (pl.col("region_name") == "Africa"),
+            "Liberia": pl.col("country") == "Liberia",
+        },
+        index_cols=INDEX_COLS,
+        ind='code'
+    )
+    pivots["Liberia"]
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""## Profiling""")
+    return
+
+
+@app.cell
+def _(nx):
+    # Plans, node timings, row counts and memory of the profiled calls so far
+    # (empty unless profiling is enabled; re-run after the cells to inspect)
+    nx.profile_panel()
+    return
+
+
 @app.cell
 def _():
     return
@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks import import_time
+
+
+@pytest.mark.parametrize("statement", import_time.IMPORTS)
+def test_import_is_within_budget(statement):
+    result = import_time.measure(statement, repeat=3)
+    assert result["heavy"] == []
+    assert result["ms"] <= import_time.BUDGET_MS
@@ -0,0 +1,40 @@
+import polars as pl
+import pytest
+
+from benchmarks.synthetic import generate_nexus
+from tools.country_dim import FACT_COLUMNS, split_country_dim
+from tools.dataset import scan_nexus
+from tools.ingest import ingest_partition
+from tools.load import prepare_nexus
+
+
+@pytest.fixture
+def fact_dataset(tmp_path):
+    raw = generate_nexus(tmp_path / "raw.parquet", 2_000, countries=20, indicators=30, sources=2, collections=2)
+    split_country_dim(raw, tmp_path / "nexus", tmp_path / "dim.parquet")
+    return raw, tmp_path / "nexus", tmp_path / "dim.parquet"
+
+
+@pytest.mark.parametrize("mode", ["replace", "append"])
+def test_ingest_raw_rows_into_fact_dataset(fact_dataset, mode):
+    raw, dataset_dir, dim_path = fact_dataset
+    rows = pl.read_parquet(raw).filter(pl.col("source") == "Source 0")
+
+    ingest_partition(rows, dataset_dir, mode, country_dim_path=dim_path)
+
+    nexus = scan_nexus(dataset_dir).collect()
+    assert sorted(nexus.columns) == sorted(FACT_COLUMNS)
+    expected = rows.height * (2 if mode == "append" else 1) + pl.read_parquet(raw).filter(pl.col("source") != "Source 0").height
+    assert nexus.height == expected
+    # The dimension still joins onto what was written
+    assert "income_level" in prepare_nexus(scan_nexus(dataset_dir), pl.scan_parquet(dim_path)).collect().columns
+
+
+def test_ingest_rejects_rows_of_the_wrong_layout(fact_dataset):
+    raw, dataset_dir, dim_path = fact_dataset
+    facts = pl.read_parquet(raw).select(FACT_COLUMNS)
+
+    with pytest.raises(ValueError):
+        ingest_partition(facts.drop("iso3"), dataset_dir, country_dim_path=dim_path)
+    with pytest.raises(ValueError):
+        ingest_partition(facts, dataset_dir)
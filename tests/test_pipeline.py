@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import polars as pl
+
+from benchmarks.synthetic import generate_nexus
+from tools.country_dim import FACT_COLUMNS, build_country_dim
+from tools.dataset import scan_nexus
+from tools.ingest import read_derived_metadata
+from tools.pipeline import run_ingest
+from tools.sources import clean_facts
+
+
+def fact_processor(raw_path):
+    """Processor emitting the slim fact layout, as `clean_facts` without a dimension does."""
+    return clean_facts(pl.scan_parquet(Path(raw_path) / "raw.parquet").select(FACT_COLUMNS))
+
+
+def test_run_ingest_of_fact_rows_with_a_country_dimension(tmp_path):
+    raw = generate_nexus(tmp_path / "raw" / "raw.parquet", 2_000, countries=20, indicators=30, sources=2)
+    dim_path = tmp_path / "dim.parquet"
+    build_country_dim(pl.scan_parquet(raw)).write_parquet(dim_path)
+
+    run_ingest(
+        {"facts": f"{__name__}:fact_processor"},
+        tmp_path / "raw",
+        tmp_path / "nexus",
+        workers=1,
+        country_dim_path=dim_path
+    )
+
+    assert scan_nexus(tmp_path / "nexus").select(pl.len()).collect().item() == 2_000
+    assert read_derived_metadata(tmp_path / "nexus")["base_stats"]["count_rows"].sum() == 2_000
@@ -0,0 +1,25 @@
+import sys
+
+import polars as pl
+
+from benchmarks import synthetic
+
+
+def test_cells_are_distinct(tmp_path):
+    df = pl.read_parquet(synthetic.generate_nexus(tmp_path / "out.parquet", 5_000, countries=10, indicators=20))
+    assert df.height == 5_000
+    assert not df.select(pl.struct("indicator_code", "country_or_area", "year").is_duplicated().any()).item()
+
+
+def test_no_rows_writes_an_empty_file(tmp_path):
+    df = pl.read_parquet(synthetic.generate_nexus(tmp_path / "out.parquet", 0))
+    assert df.height == 0
+    assert df.columns == synthetic.NEXUS_COLUMNS
+
+
+def test_cli_leaves_the_indicator_count_to_generate_nexus(monkeypatch):
+    calls = []
+    monkeypatch.setattr(synthetic, "generate_nexus", lambda *args, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(sys, "argv", ["synthetic", "out.parquet", "--rows", "100000000"])
+    synthetic.main()
+    assert calls[0]["indicators"] is None
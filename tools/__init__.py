@@ -1,10 +1,129 @@
+"""Tools module.
 
-"""Tools module."""
+Submodules are imported on first use of one of their names (PEP 562), so a script that
+only needs `datamap` does not pay for the ingest, sketch or NumPy-backed tools.
+"""
 
+import importlib
+from typing import TYPE_CHECKING
+
+# These submodules share a name with their function: importing the submodule from anywhere
+# sets the package attribute to the module, so they are bound eagerly (both are light).
 from .datamap import datamap
-from .filter_pivot import filter_pivot
+from .filter_pivot import filter_pivot, filter_pivot_many
+
+# Public name → submodule defining it
+_EXPORTS = {
+    'datamap': 'datamap',
+    'filter_pivot': 'filter_pivot',
+    'filter_pivot_many': 'filter_pivot',
+    'SparsePivot': 'sparse_pivot',
+    'ResultCache': 'cache',
+    'parquet_fingerprint': 'cache',
+    'compact_nexus': 'dataset',
+    'read_manifest': 'dataset',
+    'scan_nexus': 'dataset',
+    'income_level': 'load',
+    'load_nexus': 'load',
+    'build_country_dim': 'country_dim',
+    'join_country_dim': 'country_dim',
+    'split_country_dim': 'country_dim',
+    'indicators_metadata': 'ingest',
+    'ingest_partition': 'ingest',
+    'refresh_derived_metadata': 'ingest',
+    'clean_facts': 'sources',
+    'scan_raw': 'sources',
+    'sink_partitions': 'sources',
+    'to_fact_layout': 'sources',
+    'unpivot_years': 'sources',
+    'build_nexus': 'pipeline',
+    'run_ingest': 'pipeline',
+    'PresenceIndex': 'presence',
+    'presence_path': 'presence',
+    'StatsSketch': 'sketch',
+    'dataset_base_stats': 'sketch',
+    'sketch_partitions': 'sketch',
+    'load_snapshot': 'snapshot',
+    'snapshot_path': 'snapshot',
+    'configure_profiling': 'profiling',
+    'profile_panel': 'profiling',
+    'profile_report': 'profiling',
+    'profiled': 'profiling',
+    'Backend': 'backends',
+    'available_backends': 'backends',
+    'get_backend': 'backends',
+    'register_backend': 'backends',
+}
+
+if TYPE_CHECKING:
+    from .sparse_pivot import SparsePivot
+    from .cache import ResultCache, parquet_fingerprint
+    from .dataset import compact_nexus, read_manifest, scan_nexus
+    from .load import income_level, load_nexus
+    from .country_dim import build_country_dim, join_country_dim, split_country_dim
+    from .ingest import indicators_metadata, ingest_partition, refresh_derived_metadata
+    from .sources import clean_facts, scan_raw, sink_partitions, to_fact_layout, unpivot_years
+    from .pipeline import build_nexus, run_ingest
+    from .presence import PresenceIndex, presence_path
+    from .sketch import StatsSketch, dataset_base_stats, sketch_partitions
+    from .snapshot import load_snapshot, snapshot_path
+    from .profiling import configure_profiling, profile_panel, profile_report, profiled
+    from .backends import Backend, available_backends, get_backend, register_backend
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _EXPORTS.values():
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value   # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     'datamap',
-    'filter_pivot'
-]
\ No newline at end of file
+    'filter_pivot',
+    'filter_pivot_many',
+    'SparsePivot',
+    'ResultCache',
+    'parquet_fingerprint',
+    'compact_nexus',
+    'read_manifest',
+    'scan_nexus',
+    'income_level',
+    'load_nexus',
+    'build_country_dim',
+    'join_country_dim',
+    'split_country_dim',
+    'indicators_metadata',
+    'ingest_partition',
+    'refresh_derived_metadata',
+    'clean_facts',
+    'scan_raw',
+    'sink_partitions',
+    'to_fact_layout',
+    'unpivot_years',
+    'build_nexus',
+    'run_ingest',
+    'PresenceIndex',
+    'presence_path',
+    'StatsSketch',
+    'dataset_base_stats',
+    'sketch_partitions',
+    'Backend',
+    'available_backends',
+    'get_backend',
+    'register_backend',
+    'configure_profiling',
+    'profile_panel',
+    'profile_report',
+    'profiled',
+    'load_snapshot',
+    'snapshot_path'
+]
@@ -0,0 +1,69 @@
+"""Command line entry point: python -m tools <command> ..."""
+
+import argparse
+from pathlib import Path
+
+import yaml
+
+from .country_dim import split_country_dim
+from .dataset import ROW_GROUP_SIZE, compact_nexus, scan_nexus
+from .ingest import ingest_partition
+from .pipeline import build_nexus
+from .sketch import dataset_base_stats, sketch_partitions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m tools", description="Nexus dataset maintenance.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact = commands.add_parser("compact", help="Rewrite nexus.parquet as a sorted, partitioned dataset.")
+    compact.add_argument("source_path", help="e.g. data/processed/nexus.parquet")
+    compact.add_argument("dest", help="e.g. data/processed/nexus")
+    compact.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE)
+
+    country_dim = commands.add_parser(
+        "country-dim", help="Split nexus.parquet into a slim fact dataset and a country dimension."
+    )
+    country_dim.add_argument("source_path", help="e.g. data/processed/nexus.parquet")
+    country_dim.add_argument("fact_dest", help="e.g. data/processed/nexus")
+    country_dim.add_argument("dim_path", help="e.g. data/processed/country_dim.parquet")
+    country_dim.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE)
+
+    ingest = commands.add_parser(
+        "ingest", help="Replace or append the partitions of one source's new rows in a dataset."
+    )
+    ingest.add_argument("rows_path", help="parquet file of new rows in the raw nexus layout")
+    ingest.add_argument("dataset_dir", help="e.g. data/processed/nexus")
+    ingest.add_argument("--mode", choices=["replace", "append"], default="replace")
+    ingest.add_argument("--country-dim", dest="country_dim_path", default=None)
+
+    sketch = commands.add_parser(
+        "sketch", help="Store per-partition statistics sketches and print the merged base stats."
+    )
+    sketch.add_argument("dataset_dir", help="e.g. data/processed/nexus")
+    sketch.add_argument("--country-dim", dest="country_dim_path", default=None)
+
+    build = commands.add_parser(
+        "build", help="Run the source processors in parallel, writing each to its own partitions."
+    )
+    build.add_argument("--config", default="config.yaml")
+    build.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args()
+    if args.command == "compact":
+        print(compact_nexus(args.source_path, args.dest, args.row_group_size))
+    elif args.command == "country-dim":
+        print(split_country_dim(args.source_path, args.fact_dest, args.dim_path, args.row_group_size))
+    elif args.command == "ingest":
+        print(ingest_partition(scan_nexus(args.rows_path), args.dataset_dir, args.mode, args.country_dim_path))
+    elif args.command == "sketch":
+        sketch_partitions(args.dataset_dir, country_dim_path=args.country_dim_path)
+        print(dataset_base_stats(args.dataset_dir))
+    elif args.command == "build":
+        with open(args.config) as f:
+            config = yaml.safe_load(f)
+        print(build_nexus(config, Path(args.config).parent, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Execution backend registry tool implementation."""
+
+from typing import Callable, Dict, List, NamedTuple
+
+
+class Backend(NamedTuple):
+    """
+    One engine's implementations of the tools and utils entry points.
+
+    Every function takes the backend's own nexus handle as first argument (a Polars
+    LazyFrame, a DuckDB relation, ...), as returned by its `load_nexus`, and returns
+    Polars DataFrames, so results can be compared and cached across engines.
+    """
+
+    name: str
+    load_nexus: Callable
+    datamap: Callable
+    filter_pivot: Callable
+    calculate_base_stats: Callable
+    get_sub_region_info: Callable
+    calculate_sub_region_coverage: Callable
+    create_indicators_metadata: Callable
+
+
+def _polars_backend() -> Backend:
+    import utils
+
+    from .datamap import datamap
+    from .filter_pivot import filter_pivot
+    from .load import load_nexus
+
+    return Backend(
+        name="polars",
+        load_nexus=load_nexus,
+        datamap=datamap,
+        filter_pivot=filter_pivot,
+        calculate_base_stats=utils.calculate_base_stats,
+        get_sub_region_info=utils.get_sub_region_info,
+        calculate_sub_region_coverage=utils.calculate_sub_region_coverage,
+        create_indicators_metadata=utils.create_indicators_metadata,
+    )
+
+
+def _duckdb_backend() -> Backend:
+    from . import duckdb_backend as duckdb
+
+    return Backend(
+        name="duckdb",
+        load_nexus=duckdb.load_nexus,
+        datamap=duckdb.datamap,
+        filter_pivot=duckdb.filter_pivot,
+        calculate_base_stats=duckdb.calculate_base_stats,
+        get_sub_region_info=duckdb.get_sub_region_info,
+        calculate_sub_region_coverage=duckdb.calculate_sub_region_coverage,
+        create_indicators_metadata=duckdb.create_indicators_metadata,
+    )
+
+
+# Factories, so an engine's dependencies are only imported when it is used
+_BACKENDS: Dict[str, Callable[[], Backend]] = {
+    "polars": _polars_backend,
+    "duckdb": _duckdb_backend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], Backend]) -> None:
+    """Make a backend available to `get_backend` under `name`."""
+    _BACKENDS[name] = factory
+
+
+def get_backend(name: str = "polars") -> Backend:
+    """
+    Look up an execution backend by name.
+
+    Parameters
+    ----------
+    name
+        'polars' (the default LazyFrame implementation), 'duckdb', or a name added
+        with `register_backend`.
+
+    Returns
+    -------
+    Backend
+        The backend's entry points.
+    """
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; available: {', '.join(available_backends())}")
+    return _BACKENDS[name]()
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends."""
+    return list(_BACKENDS)
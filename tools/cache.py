@@ -0,0 +1,209 @@
+"""Persistent result cache tool implementation."""
+
+import hashlib
+import inspect
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import weakref
+from pathlib import Path
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, List, Optional, Union
+import polars as pl
+
+# Marks an in-memory DataFrame source in an unoptimized query plan
+_IN_MEMORY_SOURCE = re.compile(r"^\s*DF \[", re.MULTILINE)
+# Scan node ids in plans, which differ between processes
+_SCAN_ID = re.compile(r" \[id: \d+\]")
+
+# Content hashes of live in-memory LazyFrames, by id: their data cannot change, so each
+# frame is hashed once (entries are dropped when the frame is garbage collected)
+_CONTENT_DIGESTS: Dict[int, int] = {}
+
+
+def parquet_files(path: Union[str, Path]) -> List[Path]:
+    """List the parquet files behind `path`, which is either a single file or a dataset directory."""
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.rglob("*.parquet"))
+    return [path]
+
+
+def parquet_fingerprint(path: Union[str, Path]) -> str:
+    """
+    Fingerprint a parquet file (or dataset directory) from its size, mtime and row-group statistics.
+
+    Only file metadata and parquet footers are read, never the data pages.
+    """
+    import pyarrow.parquet as pq
+
+    digest = hashlib.sha256()
+    for file in parquet_files(path):
+        stat = file.stat()
+        digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        # Row-group row counts and per-column min/max/null statistics
+        metadata = pq.read_metadata(file).to_dict()
+        digest.update(json.dumps(metadata["row_groups"], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of DataFrame results, keyed by the nexus parquet fingerprint and the call arguments.
+
+    Results are stored as Arrow IPC files under `cache_dir`. When the total size exceeds
+    `max_bytes`, the least recently used entries are evicted.
+
+    Keys cover the code of the function and of the project functions it calls by name
+    (e.g. `utils.base_stats_plan` under `utils.calculate_base_stats`), but not code
+    reached otherwise (imports inside the function, methods); `clear` the cache after
+    changing those. LazyFrame arguments over in-memory data (e.g. the `load_snapshot`
+    frame) are keyed on a hash of their rows, computed once per frame object.
+
+    Parameters
+    ----------
+    data_path
+        The nexus parquet file (or partitioned dataset directory) the cached results derive from.
+    cache_dir
+        Directory holding the cached results.
+    max_bytes
+        Upper bound on the total size of the cache directory.
+
+    Examples
+    --------
+    >>> cache = ResultCache.from_config(config)
+    >>> base_stats = cache(calculate_base_stats, nexus)
+    """
+
+    def __init__(
+        self,
+        data_path: Union[str, Path],
+        cache_dir: Union[str, Path],
+        max_bytes: int = 512 * 1024**2
+    ):
+        self.data_path = Path(data_path)
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], root: Optional[Path] = None) -> "ResultCache":
+        """Build the cache from config.yaml's `data.nexus_path` and `cache` settings."""
+        root = Path.cwd() if root is None else Path(root)
+        return cls(
+            data_path=root / config["data"]["nexus_path"],
+            cache_dir=root / config["cache"]["dir"],
+            max_bytes=int(config["cache"]["max_bytes"]),
+        )
+
+    def __call__(self, fn: Callable[..., pl.DataFrame], *args: Any, **kwargs: Any) -> pl.DataFrame:
+        """Return `fn(*args, **kwargs)`, read from the cache when a result for this data version exists."""
+        path = self.cache_dir / f"{self.key(fn, *args, **kwargs)}.arrow"
+        if path.exists():
+            os.utime(path)  # mark as recently used
+            return pl.read_ipc(path, memory_map=False)
+
+        result = fn(*args, **kwargs)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Unique per writer; the rename is atomic, so concurrent readers never see partial files
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as tmp:
+            result.write_ipc(tmp)
+        os.replace(tmp.name, path)
+        self._evict()
+        return result
+
+    def key(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+        """Hash of the data fingerprint, the function's code and its arguments."""
+        digest = hashlib.sha256()
+        digest.update(parquet_fingerprint(self.data_path).encode())
+        digest.update(f"{fn.__module__}.{fn.__qualname__}".encode())
+        digest.update(_function_digest(inspect.unwrap(fn)))  # the body, not a decorator's wrapper
+        for name, value in [*enumerate(args), *sorted(kwargs.items())]:
+            digest.update(f"{name}=".encode())
+            digest.update(_value_digest(value))
+        return digest.hexdigest()
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        for path in self.cache_dir.glob("*.arrow"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        entries = sorted(
+            (entry.stat().st_mtime_ns, entry.stat().st_size, entry)
+            for entry in self.cache_dir.glob("*.arrow")
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+def _code_digest(code: CodeType) -> bytes:
+    """Hash a function's bytecode, including nested functions, so edits invalidate its entries."""
+    digest = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        digest.update(_code_digest(const) if isinstance(const, CodeType) else repr(const).encode())
+    return digest.digest()
+
+
+def _function_digest(fn: FunctionType, seen: Optional[set] = None) -> bytes:
+    """Hash a function's code and that of the project functions it calls through its globals."""
+    seen = set() if seen is None else seen
+    seen.add(fn)
+    digest = hashlib.sha256(_code_digest(fn.__code__))
+    for name in _global_names(fn.__code__):
+        callee = inspect.unwrap(fn.__globals__.get(name)) if name in fn.__globals__ else None
+        if isinstance(callee, FunctionType) and callee not in seen and _is_project_code(callee):
+            digest.update(name.encode())
+            digest.update(_function_digest(callee, seen))
+    return digest.digest()
+
+
+def _global_names(code: CodeType) -> List[str]:
+    """Names a function's code (and its nested functions) may look up in its globals."""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names.extend(_global_names(const))
+    return sorted(set(names))
+
+
+def _is_project_code(fn: FunctionType) -> bool:
+    """Whether `fn` is defined in this project rather than in the standard library or a package."""
+    module = sys.modules.get(fn.__module__)
+    path = getattr(module, "__file__", None) or ""
+    return bool(path) and "site-packages" not in path and not path.startswith(sys.base_prefix)
+
+
+def _content_digest(value: pl.LazyFrame) -> int:
+    """Order-sensitive hash of a LazyFrame's rows, computed once per frame object."""
+    key = id(value)
+    if key not in _CONTENT_DIGESTS:
+        # Rows weighted by position, so reordered rows hash differently; categoricals
+        # as strings, since their physical codes vary between sessions
+        _CONTENT_DIGESTS[key] = value.with_columns(pl.col(pl.Categorical).cast(pl.String)).select(
+            (pl.struct(pl.all()).hash(seed=0) * (pl.int_range(pl.len(), dtype=pl.UInt64) + 1)).sum()
+        ).collect(engine="streaming").item()
+        weakref.finalize(value, _CONTENT_DIGESTS.pop, key, None)
+    return _CONTENT_DIGESTS[key]
+
+
+def _value_digest(value: Any) -> bytes:
+    """Hash an argument: query plans for LazyFrames (plus contents over in-memory data), contents for DataFrames, repr otherwise."""
+    if isinstance(value, pl.LazyFrame):
+        plan = _SCAN_ID.sub("", value.explain(optimized=False))
+        digest = hashlib.sha256(plan.encode())
+        if _IN_MEMORY_SOURCE.search(plan):
+            digest.update(str(_content_digest(value)).encode())
+        return digest.digest()
+    if isinstance(value, pl.DataFrame):
+        buffer = io.BytesIO()
+        value.write_ipc(buffer)
+        return hashlib.sha256(buffer.getvalue()).digest()
+    return hashlib.sha256(repr(value).encode()).digest()
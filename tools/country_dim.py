@@ -0,0 +1,113 @@
+"""Country dimension tool implementation."""
+
+from pathlib import Path
+from typing import List, Optional, Union
+import polars as pl
+
+from .dataset import ROW_GROUP_SIZE, compact_nexus, scan_nexus
+from .load import income_level
+
+# Columns that vary per observation; everything else in nexus is a country attribute
+FACT_COLUMNS = [
+    "iso3", "year", "value",
+    "source", "database", "collection",
+    "indicator_code", "indicator_label", "value_meta"
+]
+FACT_SORT_COLUMNS = ["collection", "indicator_code", "iso3", "year"]
+
+
+def build_country_dim(nexus: pl.LazyFrame) -> pl.DataFrame:
+    """
+    Fold the country-level columns of the nexus table into one row per iso3.
+
+    Parameters
+    ----------
+    nexus
+        The raw nexus LazyFrame (with `country_or_area` and the income classification columns).
+
+    Returns
+    -------
+    pl.DataFrame
+        The country dimension: `iso3`, every non-fact column, and `income_level` as an Enum,
+        computed once per country instead of once per row.
+    """
+    attributes = [col for col in nexus.collect_schema().names() if col not in FACT_COLUMNS]
+    return (
+        nexus
+        .select("iso3", *attributes)
+        .filter(pl.col("iso3").is_not_null())
+        .unique(subset="iso3", keep="first")
+        .with_columns(income_level())
+        .sort("iso3")
+        .collect()
+    )
+
+
+def split_country_dim(
+    source_path: Union[str, Path],
+    fact_dest: Union[str, Path],
+    dim_path: Union[str, Path],
+    row_group_size: int = ROW_GROUP_SIZE
+) -> pl.DataFrame:
+    """
+    Ingest step: write the nexus data as a slim fact dataset plus a country dimension file.
+
+    The fact dataset (see `compact_nexus`) keeps only `FACT_COLUMNS`, so the wide
+    classification columns are no longer repeated on every row. Rows without an iso3
+    have no country attributes once split.
+
+    Parameters
+    ----------
+    source_path
+        The nexus parquet file or dataset directory to split.
+    fact_dest
+        Output directory for the partitioned fact dataset (config.yaml's `nexus_path`).
+    dim_path
+        Output parquet file for the country dimension (config.yaml's `country_dim_path`).
+    row_group_size
+        Rows per row group in the fact files.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per fact file written, as returned by `compact_nexus`.
+    """
+    dim = build_country_dim(scan_nexus(source_path))
+    Path(dim_path).parent.mkdir(parents=True, exist_ok=True)
+    dim.write_parquet(dim_path, statistics=True)
+
+    return compact_nexus(
+        source_path,
+        fact_dest,
+        row_group_size,
+        columns=FACT_COLUMNS,
+        sort_by=FACT_SORT_COLUMNS
+    )
+
+
+def join_country_dim(
+    fact: pl.LazyFrame,
+    dim: Union[pl.LazyFrame, pl.DataFrame],
+    columns: Optional[List[str]] = None
+) -> pl.LazyFrame:
+    """
+    Attach country attributes to fact rows on demand.
+
+    Parameters
+    ----------
+    fact
+        The slim fact LazyFrame.
+    dim
+        The country dimension, e.g. `pl.scan_parquet(country_dim_path)`.
+    columns
+        Dimension columns to attach. Defaults to all of them.
+
+    Returns
+    -------
+    pl.LazyFrame
+        `fact` left-joined with the (selected) country attributes on iso3.
+    """
+    dim = dim.lazy()
+    if columns is not None:
+        dim = dim.select("iso3", *[col for col in columns if col != "iso3"])
+    return fact.join(dim, on="iso3", how="left")
@@ -3,6 +3,9 @@
 from typing import List, Optional
 import polars as pl
 
+from .profiling import collect, profiled
+
+@profiled
 def datamap(
     df: pl.LazyFrame,
     source_metadata_columns: List[str],
@@ -37,5 +40,5 @@ def datamap(
         .group_by(group_cols)
         .agg(pl.count().alias("count"))
         .sort(group_cols + ["count"])
-        .collect()
+        .pipe(collect)
     )
\ No newline at end of file
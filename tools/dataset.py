@@ -0,0 +1,211 @@
+"""Partitioned nexus dataset tool implementation."""
+
+import json
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from urllib.parse import quote
+import polars as pl
+
+# Hive partition column, and the sort order applied inside each partition so that
+# row-group min/max statistics on these columns are tight enough to skip row groups
+PARTITION_COLUMN = "source"
+SORT_COLUMNS = ["collection", "indicator_code", "country_or_area", "year"]
+ROW_GROUP_SIZE = 16_384
+MANIFEST_FILE = "_manifest.json"
+# Directory name of a null partition value; Polars' hive reader reads it back as null
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# A (source, collection) pair, the unit each partition file holds
+Partition = Tuple[Optional[str], Optional[str]]
+
+_MANIFEST_SCHEMA = {
+    "source": pl.String,
+    "collection": pl.String,
+    "path": pl.String,
+    "rows": pl.Int64,
+    "bytes": pl.Int64,
+    "indicators": pl.Int64,
+    "min_year": pl.Int64,
+    "max_year": pl.Int64,
+    "updated_at": pl.String,
+}
+
+
+def scan_nexus(path: Union[str, Path]) -> pl.LazyFrame:
+    """
+    Lazily scan the nexus data, either a single parquet file or a partitioned dataset directory.
+
+    Parameters
+    ----------
+    path
+        config.yaml's `nexus_path`: a parquet file, or a directory written by `compact_nexus`.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The raw nexus table. For a directory, `source` is read from the hive partition paths,
+        so filters on it only open the matching partitions.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return pl.scan_parquet(
+            path / "**" / "*.parquet",
+            hive_partitioning=True,
+            hive_schema={PARTITION_COLUMN: pl.String}
+        )
+    return pl.scan_parquet(path)
+
+
+def partition_file(dest: Union[str, Path], source: Optional[str], collection: Optional[str]) -> Path:
+    """Path of the file holding one collection inside its hive `source` partition."""
+    name = "__null__" if collection is None else quote(collection, safe="")
+    directory = NULL_PARTITION if source is None else quote(source, safe="")
+    return Path(dest) / f"{PARTITION_COLUMN}={directory}" / f"part-{name}.parquet"
+
+
+def write_partition_file(
+    df: pl.DataFrame,
+    path: Path,
+    row_group_size: int = ROW_GROUP_SIZE,
+    sort_by: Optional[List[str]] = None
+) -> None:
+    """Write one sorted partition file with dictionary-encoded strings and row-group statistics."""
+    import pyarrow.parquet as pq
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    pq.write_table(
+        df.sort(sort_by or SORT_COLUMNS, nulls_last=True).drop(PARTITION_COLUMN, strict=False).to_arrow(),
+        tmp,
+        row_group_size=row_group_size,
+        use_dictionary=True,      # low-cardinality strings stay small and compare fast
+        write_statistics=True,    # per row-group min/max for predicate pushdown
+        compression="zstd"
+    )
+    tmp.replace(path)
+
+
+def compact_nexus(
+    source_path: Union[str, Path],
+    dest: Union[str, Path],
+    row_group_size: int = ROW_GROUP_SIZE,
+    columns: Optional[List[str]] = None,
+    sort_by: Optional[List[str]] = None
+) -> pl.DataFrame:
+    """
+    Rewrite the nexus parquet as a sorted, hive-partitioned dataset.
+
+    Each `source` becomes a `source=<value>` directory holding one file per collection,
+    sorted by (collection, indicator_code, country_or_area, year); rows without a source
+    go to the `NULL_PARTITION` directory. The input is read once, streamed into its
+    partition files. Point config.yaml's `nexus_path` at `dest` to use it.
+
+    Parameters
+    ----------
+    source_path
+        The single nexus parquet file (or an existing dataset directory, `dest` included) to rewrite.
+    dest
+        Output directory. It is replaced as a whole once every file is written, so partitions
+        the input no longer holds, and anything derived from the old files, are gone.
+    row_group_size
+        Rows per row group. Smaller groups skip more precisely, larger groups compress better.
+    columns
+        Columns to keep. Defaults to all of them.
+    sort_by
+        Sort order inside each file. Defaults to `SORT_COLUMNS`.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per file written, with its source, collection, path and row count.
+    """
+    from .sources import sink_partitions   # sources imports this module
+
+    dest = Path(dest)
+    nexus = scan_nexus(source_path)
+    if columns is not None:
+        nexus = nexus.select(columns)
+
+    staging = staging_dir(dest)
+    try:
+        written = sink_partitions(nexus, staging, sort=True, row_group_size=row_group_size, sort_by=sort_by)
+        update_manifest(staging, written.select("source", "collection").rows())
+        swap_dir(staging, dest)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return pl.DataFrame(
+        [
+            {**row, "path": str(partition_file(dest, row["source"], row["collection"]))}
+            for row in written.iter_rows(named=True)
+        ],
+        schema={"source": pl.String, "collection": pl.String, "path": pl.String, "rows": pl.Int64}
+    )
+
+
+def staging_dir(dest: Union[str, Path]) -> Path:
+    """A new empty directory next to `dest` (same filesystem), to build its replacement in."""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(dir=dest.parent, prefix=f".{dest.name}."))
+
+
+def swap_dir(staging: Path, dest: Union[str, Path]) -> None:
+    """Replace `dest` with `staging` by renames, so readers see either the old or the new files."""
+    dest = Path(dest)
+    old = staging.with_name(f"{staging.name}.old")
+    if dest.exists():
+        dest.rename(old)
+    staging.rename(dest)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def read_manifest(dataset_dir: Union[str, Path]) -> pl.DataFrame:
+    """Per-file row counts and statistics of a partitioned dataset, one row per (source, collection)."""
+    path = Path(dataset_dir) / MANIFEST_FILE
+    if not path.exists():
+        return pl.DataFrame(schema=_MANIFEST_SCHEMA)
+    return pl.DataFrame(json.loads(path.read_text())["partitions"], schema=_MANIFEST_SCHEMA)
+
+
+def update_manifest(dataset_dir: Union[str, Path], partitions: List[Partition]) -> pl.DataFrame:
+    """Recompute the manifest entries of `partitions` from their files and save the manifest."""
+    dataset_dir = Path(dataset_dir)
+    entries = pl.DataFrame(
+        [_manifest_entry(dataset_dir, source, collection) for source, collection in partitions],
+        schema=_MANIFEST_SCHEMA
+    )
+    manifest = (
+        pl.concat([
+            read_manifest(dataset_dir).join(entries, on=["source", "collection"], how="anti", nulls_equal=True),
+            entries
+        ])
+        .sort("source", "collection")
+    )
+    tmp = dataset_dir / f"{MANIFEST_FILE}.tmp"
+    tmp.write_text(json.dumps({"partitions": manifest.to_dicts()}, indent=2))
+    tmp.replace(dataset_dir / MANIFEST_FILE)
+    return entries
+
+
+def _manifest_entry(dataset_dir: Path, source: Optional[str], collection: Optional[str]) -> dict:
+    """Manifest entry for one partition file, computed from its contents."""
+    path = partition_file(dataset_dir, source, collection)
+    stats = pl.scan_parquet(path).select(
+        rows=pl.len(),
+        indicators=pl.col("indicator_code").n_unique(),
+        min_year=pl.col("year").min(),
+        max_year=pl.col("year").max(),
+    ).collect().row(0, named=True)
+    return {
+        "source": source,
+        "collection": collection,
+        "path": str(path.relative_to(dataset_dir)),
+        "bytes": path.stat().st_size,
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **stats,
+    }
+
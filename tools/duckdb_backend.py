@@ -0,0 +1,249 @@
+"""DuckDB execution backend tool implementation."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Union
+import polars as pl
+
+from .dataset import NULL_PARTITION, PARTITION_COLUMN
+
+_COUNT_COLUMNS = ["count", "count_rows", "count_missing_value", "num_countries_with_data",
+                  "num_years_with_data", "total_countries", "countries_with_data"]
+
+# Same mapping as `tools.income_level`
+_INCOME_LEVEL_SQL = """
+    CASE
+        WHEN high_income = 'High income' THEN 'High Income'
+        WHEN upper_middle_income = 'Upper middle income' THEN 'Upper Middle Income'
+        WHEN lower_middle_income = 'Lower middle income' THEN 'Lower Middle Income'
+        WHEN low_income = 'Low income' THEN 'Low Income'
+    END
+"""
+
+# Polars' n_unique counts null as a value; COUNT(DISTINCT ...) does not
+_N_UNIQUE_SQL = "count(DISTINCT {col}) + (count(*) > count({col}))::INTEGER"
+
+
+def connect(memory_limit: Optional[str] = None, temp_directory: Optional[Union[str, Path]] = None):
+    """
+    Open an in-memory DuckDB connection.
+
+    Parameters
+    ----------
+    memory_limit
+        e.g. '4GB'. Past it, pivots and aggregations spill to `temp_directory`.
+    temp_directory
+        Where spilled data goes. Defaults to DuckDB's own (`.tmp` next to the database).
+    """
+    import duckdb
+
+    config: Dict[str, str] = {}
+    if memory_limit is not None:
+        config["memory_limit"] = memory_limit
+    if temp_directory is not None:
+        config["temp_directory"] = str(temp_directory)
+    return duckdb.connect(config=config)
+
+
+_DEFAULT_CONNECTION = None
+
+
+def default_connection():
+    """Shared connection for relations loaded without one (relations do not keep theirs alive)."""
+    global _DEFAULT_CONNECTION
+    if _DEFAULT_CONNECTION is None:
+        _DEFAULT_CONNECTION = connect()
+    return _DEFAULT_CONNECTION
+
+
+def scan_nexus(con, path: Union[str, Path]):
+    """DuckDB relation over the raw nexus data, a parquet file or a `compact_nexus` dataset directory."""
+    path = Path(path)
+    if path.is_dir():
+        # DuckDB reads the null partition's directory name as a value
+        return con.sql(
+            f"SELECT * REPLACE (nullif({PARTITION_COLUMN}, {_literal(NULL_PARTITION)}) AS {PARTITION_COLUMN}) "
+            f"FROM read_parquet({_literal(str(path / '**' / '*.parquet'))}, "
+            f"hive_partitioning = true, hive_types = {{'{PARTITION_COLUMN}': 'VARCHAR'}})"
+        )
+    return con.sql(f"SELECT * FROM read_parquet({_literal(str(path))})")
+
+
+def load_nexus(config: Dict[str, Any], root: Optional[Path] = None, con=None):
+    """
+    `tools.load_nexus` as a lazy DuckDB relation.
+
+    `country_or_area` is renamed to `country` and `income_level` derived (or joined from
+    `data.country_dim_path`), so the relation has the columns the Polars backend sees.
+
+    Parameters
+    ----------
+    config
+        Parsed config.yaml.
+    root
+        Directory `data.nexus_path` is relative to. Defaults to the working directory.
+    con
+        DuckDB connection, e.g. from `connect`; it must outlive the relation.
+        Defaults to `default_connection()`.
+    """
+    root = Path.cwd() if root is None else Path(root)
+    con = default_connection() if con is None else con
+    nexus = scan_nexus(con, root / config["data"]["nexus_path"])
+
+    dim_path = config["data"].get("country_dim_path")
+    if dim_path:
+        dim = con.sql(f"SELECT * FROM read_parquet({_literal(str(root / dim_path))})")
+        return nexus.join(dim, "iso3", how="left").query(
+            "nexus_raw", "SELECT * EXCLUDE (country_or_area), country_or_area AS country FROM nexus_raw"
+        )
+    return nexus.query(
+        "nexus_raw",
+        f"SELECT * EXCLUDE (country_or_area), country_or_area AS country, {_INCOME_LEVEL_SQL} AS income_level "
+        "FROM nexus_raw"
+    )
+
+
+def datamap(
+    rel,
+    source_metadata_columns: List[str],
+    indicator_metadata_columns: Optional[List[str]] = None
+) -> pl.DataFrame:
+    """`tools.datamap` as a DuckDB GROUP BY."""
+    group_cols = ", ".join(_ident(col) for col in source_metadata_columns + (indicator_metadata_columns or []))
+    return _to_polars(rel.query("nexus", f"""
+        SELECT {group_cols}, count(*) AS count
+        FROM nexus
+        GROUP BY ALL
+        ORDER BY ALL NULLS FIRST
+    """))
+
+
+def filter_pivot(
+    rel,
+    index_cols: List[str],
+    ind: Literal['code', 'label'] = 'label'
+) -> pl.DataFrame:
+    """
+    `tools.filter_pivot` with DuckDB's native PIVOT.
+
+    The pivot runs out of core: past the connection's `memory_limit`, it spills to disk.
+    The result matches the Polars pivot: rows and indicator columns in order of first
+    appearance, each cell holding its first value, and a null indicator as a 'null' column.
+    """
+    from .filter_pivot import PIVOT_INDEX, _pivot_columns
+
+    cols, ind_col = _pivot_columns(index_cols, ind)
+    index = ", ".join(_ident(col) for col in PIVOT_INDEX)
+    ind_col = _ident(ind_col)
+    # Row numbers in scan order stand in for Polars' first-appearance order
+    numbered = f"SELECT {', '.join(_ident(col) for col in cols)}, row_number() OVER () AS __row FROM nexus"
+
+    # An explicit IN list keeps PIVOT a single statement, usable on a relation
+    indicators = [
+        value for (value,) in
+        rel.query("nexus", f"SELECT {ind_col} FROM ({numbered}) GROUP BY 1 ORDER BY min(__row)").fetchall()
+    ]
+    clashes = [value for value in indicators if value is not None and str(value) in PIVOT_INDEX]
+    if clashes:
+        raise ValueError(f"Indicators named like the pivot's index columns {PIVOT_INDEX}: {clashes}")
+    in_list = ", ".join(
+        "NULL AS null" if value is None else f"{_literal(str(value))} AS {_ident(str(value))}"
+        for value in indicators
+    )
+    return rel.query("nexus", f"""
+        SELECT * EXCLUDE (__first)
+        FROM (
+            PIVOT (
+                SELECT {index}, {ind_col}, value, min(__row) OVER (PARTITION BY {index}) AS __first
+                FROM ({numbered})
+                QUALIFY row_number() OVER (PARTITION BY {index}, {ind_col} ORDER BY __row) = 1
+            )
+            ON {ind_col} IN ({in_list})
+            USING any_value(value)
+            GROUP BY {index}, __first
+        )
+        ORDER BY __first
+    """).pl()
+
+def calculate_base_stats(rel) -> pl.DataFrame:
+    """
+    `utils.calculate_base_stats` in SQL, with the same columns and dtypes.
+
+    The IQR uses `quantile_disc`, which may land one rank away from Polars' 'nearest' quantile.
+    """
+    return _to_polars(rel.query("nexus", f"""
+        SELECT
+            source, collection, indicator_label,
+            count(*) AS count_rows,
+            count(*) - count(value) AS count_missing_value,
+            {_N_UNIQUE_SQL.format(col="country")} AS num_countries_with_data,
+            count(DISTINCT year) FILTER (WHERE value IS NOT NULL) AS num_years_with_data,
+            avg(value) AS mean_value,
+            median(value) AS median_value,
+            min(value) AS min_value,
+            max(value) AS max_value,
+            quantile_disc(value, 0.75) - quantile_disc(value, 0.25) AS iqr_value,
+            min(year) FILTER (WHERE value IS NOT NULL) AS min_year,
+            max(year) FILTER (WHERE value IS NOT NULL) AS max_year,
+            (count(*) - count(value)) / count(*) * 100 AS pct_missing_value
+        FROM nexus
+        GROUP BY source, collection, indicator_label
+        ORDER BY source NULLS FIRST, collection NULLS FIRST, indicator_label NULLS FIRST
+    """))
+
+
+def get_sub_region_info(rel) -> pl.DataFrame:
+    """`utils.get_sub_region_info` in SQL."""
+    return _to_polars(rel.query("nexus", """
+        SELECT sub_region_name, count(*) AS total_countries, list(country) AS countries
+        FROM (
+            SELECT DISTINCT country, sub_region_name
+            FROM nexus
+            WHERE country IS NOT NULL AND sub_region_name IS NOT NULL
+        )
+        GROUP BY sub_region_name
+    """))
+
+
+def calculate_sub_region_coverage(rel, sub_region_info: Union[pl.DataFrame, "utils.GeographyIndex"]) -> pl.DataFrame:
+    """`utils.calculate_sub_region_coverage`, with the country counts computed in SQL."""
+    import utils
+
+    return utils.sub_region_coverage_from_counts(_sub_region_counts(rel), sub_region_info)
+
+
+def create_indicators_metadata(rel, geo: Optional["utils.GeographyIndex"] = None) -> pl.DataFrame:
+    """`utils.create_indicators_metadata`, with every aggregation over rows run in SQL."""
+    import utils
+
+    if geo is None:
+        geo = utils.GeographyIndex.from_sub_region_info(get_sub_region_info(rel))
+    return utils.indicators_metadata_from_parts(calculate_base_stats(rel), _sub_region_counts(rel), geo)
+
+
+def _sub_region_counts(rel) -> pl.DataFrame:
+    """`utils.sub_region_counts_plan` over the rows with a value, in SQL."""
+    return _to_polars(rel.query("nexus", f"""
+        SELECT
+            indicator_label,
+            replace(sub_region_name, ' ', '_') AS sub_region_name_clean,
+            {_N_UNIQUE_SQL.format(col="country")} AS countries_with_data
+        FROM nexus
+        WHERE value IS NOT NULL
+        GROUP BY indicator_label, sub_region_name
+    """))
+
+
+def _to_polars(rel) -> pl.DataFrame:
+    """Fetch a relation as Polars, with counts as UInt32 like Polars' own."""
+    df = rel.pl()
+    return df.with_columns(pl.col(col).cast(pl.UInt32) for col in _COUNT_COLUMNS if col in df.columns)
+
+
+def _ident(name: str) -> str:
+    """Quote a column name for SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    """Quote a string literal for SQL."""
+    return "'" + value.replace("'", "''") + "'"
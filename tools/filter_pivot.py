@@ -1,13 +1,25 @@
 """Filter-then-pivot-pattern tool implementation."""
 
-from typing import Literal, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Literal, List, Optional, Union
 import polars as pl
 
+from .profiling import collect, profiled
+
+if TYPE_CHECKING:
+    from .sparse_pivot import SparsePivot
+
+PIVOT_INDEX = ["country", "year"]
+
+
+@profiled
 def filter_pivot(
     df: pl.LazyFrame,
     index_cols: List[str],
-    ind: Literal['code', 'label'] = 'label'
-) -> pl.DataFrame:
+    ind: Literal['code', 'label'] = 'label',
+    streaming: bool = False,
+    sparse: bool = False
+) -> Union[pl.DataFrame, "SparsePivot"]:
     """
     Pivot a LazyFrame on country and year, spreading each indicator's values into its own column.
 
@@ -19,32 +31,129 @@ def filter_pivot(
         List of columns from config.yaml's index_columns.
     ind
         If 'code', pivot on the 'indicator_code' column; if 'label', pivot on 'indicator_label'.
+    streaming
+        If True, reduce the long table with a streamed group-by to one row per
+        (country, year, indicator) cell before pivoting. Duplicate rows for a cell are
+        dropped while scanning instead of being collected; the reduced cells frame and the
+        pivot are still built in memory. The output matches the eager pivot.
+    sparse
+        If True, return a `SparsePivot` holding only the non-null cells instead of the wide
+        frame; `densify` it for the indicators actually displayed. Use it when the pivot
+        spans thousands of indicators.
 
     Returns
     -------
-    pl.DataFrame
+    pl.DataFrame or SparsePivot
         An eagerly‑collected DataFrame indexed by country and year, with one column per indicator.
     """
-    # Build cols based on ind parameter
-    if ind == "code":
-        # Replace 'indicator_label' with 'indicator_code' in index_cols
-        cols = [col.replace("indicator_label", "indicator_code") for col in index_cols]
-        ind_col = "indicator_code"
-    else:
-        # Use index_cols as is (already has indicator_label)
-        cols = index_cols
-        ind_col = "indicator_label"
+    cols, ind_col = _pivot_columns(index_cols, ind)
+
+    if streaming and not sparse:
+        return _streaming_pivot(df.select(*cols), ind_col)
 
     # Select lazily, collect to eager DataFrame, then pivot
     eager = (
         df
         .select(*cols)                    # unpack as varargs
-        .collect()
+        .pipe(collect)
     )
 
+    if sparse:
+        from .sparse_pivot import SparsePivot
+
+        return SparsePivot.from_long(eager, ind_col)
+    return _pivot(eager, ind_col)
+
+
+@profiled
+def filter_pivot_many(
+    df: pl.LazyFrame,
+    filters: Dict[str, pl.Expr],
+    index_cols: List[str],
+    ind: Literal['code', 'label'] = 'label',
+    max_workers: Optional[int] = None,
+    sparse: bool = False
+) -> Dict[str, Union[pl.DataFrame, "SparsePivot"]]:
+    """
+    Run `filter_pivot` for several filters with a single scan of `df`.
+
+    One query reads the rows matching any of the filters, evaluating every filter as a
+    boolean column along the way. Each subset is then split off the shared result and
+    pivoted on its own thread (the pivots run in Polars without holding the GIL).
+
+    Parameters
+    ----------
+    df
+        A LazyFrame containing at least the columns from index_cols and those the filters use.
+    filters
+        Name → filter expression, e.g. {'ISORA 2020': (pl.col('source') == 'ISORA') & (pl.col('year') == 2020)}.
+    index_cols
+        List of columns from config.yaml's index_columns.
+    ind
+        If 'code', pivot on the 'indicator_code' column; if 'label', pivot on 'indicator_label'.
+    max_workers
+        Threads for the pivots. Defaults to the ThreadPoolExecutor default.
+    sparse
+        If True, build `SparsePivot` results, as `filter_pivot(..., sparse=True)`.
+
+    Returns
+    -------
+    dict
+        Name → what `filter_pivot(df.filter(expr), index_cols, ind, sparse=sparse)` returns.
+    """
+    cols, ind_col = _pivot_columns(index_cols, ind)
+    masks = {name: f"__filter_{i}" for i, name in enumerate(filters)}
+
+    # One scan: the union predicate is on the raw columns, so it is pushed into the scan
+    # (row-group and hive pruning); the masks then split the matched rows
+    matched = (
+        df
+        .filter(pl.any_horizontal([expr.fill_null(False) for expr in filters.values()]))
+        .select(*cols, *[expr.fill_null(False).alias(masks[name]) for name, expr in filters.items()])
+        .pipe(collect)
+    )
+    if sparse:
+        from .sparse_pivot import SparsePivot
+
+    def pivot(name: str) -> Union[pl.DataFrame, "SparsePivot"]:
+        subset = matched.filter(pl.col(masks[name])).select(cols)
+        return SparsePivot.from_long(subset, ind_col) if sparse else _pivot(subset, ind_col)
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        return dict(zip(filters, pool.map(pivot, filters)))
+
+
+def _pivot_columns(index_cols: List[str], ind: Literal['code', 'label']) -> tuple:
+    """The columns to select and the column to pivot on for `ind`."""
+    # Build cols based on ind parameter
+    if ind == "code":
+        # Replace 'indicator_label' with 'indicator_code' in index_cols
+        return [col.replace("indicator_label", "indicator_code") for col in index_cols], "indicator_code"
+    # Use index_cols as is (already has indicator_label)
+    return index_cols, "indicator_label"
+
+
+def _pivot(eager: pl.DataFrame, ind_col: str) -> pl.DataFrame:
+    """The eager country × year pivot of `filter_pivot`."""
     return eager.pivot(
         values="value",                  # fill values from this column
-        index=["country", "year"],       # group by these cols
+        index=PIVOT_INDEX,               # group by these cols
         on=ind_col,                      # spread unique values here as new cols
         aggregate_function="first"
     )
+
+
+def _streaming_pivot(df: pl.LazyFrame, ind_col: str) -> pl.DataFrame:
+    """Pivot `df` on `ind_col` after reducing it to one row per cell with a streamed group-by."""
+    # pivot's "first" per (country, year, indicator); group order is first appearance, so
+    # the pivot below sees rows and indicators in the order the eager pivot would
+    cells = (
+        df
+        .group_by([*PIVOT_INDEX, ind_col], maintain_order=True)
+        .agg(pl.col("value").first())
+        .pipe(collect, engine="streaming")
+    )
+    clashes = cells.filter(pl.col(ind_col).cast(pl.String).is_in(PIVOT_INDEX)).get_column(ind_col).unique()
+    if clashes.len():
+        raise ValueError(f"Indicators named like the pivot's index columns {PIVOT_INDEX}: {clashes.to_list()}")
+    return _pivot(cells, ind_col)
@@ -0,0 +1,218 @@
+"""Incremental ingest tool implementation."""
+
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Union
+import polars as pl
+
+from .country_dim import FACT_COLUMNS, FACT_SORT_COLUMNS
+from .dataset import (
+    PARTITION_COLUMN,
+    Partition,
+    partition_file,
+    scan_nexus,
+    update_manifest,
+    write_partition_file
+)
+from .load import prepare_nexus
+from .sketch import SKETCH_DIR, sketch_partitions
+
+DERIVED_DIR = "_derived"   # .arrow files, so the dataset's **/*.parquet glob never picks them up
+
+
+def ingest_partition(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    dataset_dir: Union[str, Path],
+    mode: Literal["replace", "append"] = "replace",
+    country_dim_path: Optional[Union[str, Path]] = None
+) -> pl.DataFrame:
+    """
+    Write new data for one source (or some of its collections) into a partitioned nexus dataset.
+
+    Only the files of the (source, collection) pairs present in `df` are rewritten; the rest
+    of the dataset is untouched. The manifest is updated for those files, and the derived
+    metadata is refreshed only for the affected indicators (see `refresh_derived_metadata`),
+    and if the dataset keeps partition sketches, those of the touched files are rebuilt.
+
+    Parameters
+    ----------
+    df
+        Rows in the raw nexus layout, e.g. the output of one `process_*` function. For a
+        slim fact dataset, rows in the fact layout will do too; raw rows are cut down to
+        `FACT_COLUMNS`.
+    dataset_dir
+        A dataset directory written by `compact_nexus`.
+    mode
+        'replace' swaps each touched collection file for the new rows; 'append' adds the
+        new rows to what the file already holds.
+    country_dim_path
+        Country dimension to join when the dataset is the slim fact layout.
+
+    Returns
+    -------
+    pl.DataFrame
+        The manifest entries of the files written.
+
+    Raises
+    ------
+    ValueError
+        If `df` lacks the columns of the dataset's layout.
+    """
+    dataset_dir = Path(dataset_dir)
+    df = df.lazy().collect()
+    sort_by = None
+    if country_dim_path is not None:
+        # Fact files must not carry the country attributes the dimension holds
+        missing = [col for col in FACT_COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"Rows for a fact dataset lack the fact columns {missing}")
+        df = df.select(FACT_COLUMNS)
+        sort_by = FACT_SORT_COLUMNS
+    elif "country_or_area" not in df.columns:
+        raise ValueError("Rows for a raw-layout dataset lack `country_or_area`; pass `country_dim_path` for a fact dataset")
+    partitions: List[Partition] = (
+        df.select(PARTITION_COLUMN, "collection").unique().sort(pl.all()).rows()
+    )
+
+    for source, collection in partitions:
+        part = df.filter(
+            pl.col(PARTITION_COLUMN).eq_missing(source) &
+            pl.col("collection").eq_missing(collection)
+        )
+        path = partition_file(dataset_dir, source, collection)
+        if mode == "append" and path.exists():
+            existing = pl.read_parquet(path).with_columns(pl.lit(source).alias(PARTITION_COLUMN))
+            part = pl.concat([existing, part], how="diagonal_relaxed")
+        write_partition_file(part, path, sort_by=sort_by)
+
+    entries = update_manifest(dataset_dir, partitions)
+    refresh_derived_metadata(dataset_dir, partitions, country_dim_path)
+    if (dataset_dir / SKETCH_DIR).exists():
+        sketch_partitions(dataset_dir, partitions, country_dim_path)
+    return entries
+
+
+def refresh_derived_metadata(
+    dataset_dir: Union[str, Path],
+    partitions: List[Partition],
+    country_dim_path: Optional[Union[str, Path]] = None
+) -> Dict[str, pl.DataFrame]:
+    """
+    Recompute the derived metadata affected by a change to `partitions`.
+
+    The derived metadata are `calculate_base_stats` rows (keyed by source, collection and
+    indicator) and per-indicator sub-region country counts. Base stats are recomputed from
+    the changed files only; counts are recomputed only for indicators those files held
+    before or hold now, reading only the files that hold those indicators (found from the
+    base stats). Without stored metadata, everything is computed once.
+
+    Returns
+    -------
+    dict
+        'base_stats' and 'sub_region_counts' after the refresh.
+    """
+    import utils
+
+    dataset_dir = Path(dataset_dir)
+    nexus = prepare_nexus(
+        scan_nexus(dataset_dir),
+        pl.scan_parquet(country_dim_path) if country_dim_path else None
+    )
+    derived = read_derived_metadata(dataset_dir)
+    if derived is not None and not partitions:
+        return derived
+    if derived is None:
+        derived = {
+            "base_stats": utils.calculate_base_stats(nexus),
+            "sub_region_counts": utils.sub_region_counts_plan(nexus.filter(pl.col("value").is_not_null())).collect(),
+        }
+        return _write_derived(dataset_dir, derived)
+
+    keys = pl.DataFrame(partitions, schema=["source", "collection"], orient="row")
+    old_rows = derived["base_stats"].join(keys, on=["source", "collection"], nulls_equal=True)
+    new_rows = utils.calculate_base_stats(nexus.filter(_in_partitions(partitions))).cast(derived["base_stats"].schema)
+    labels = pl.concat([old_rows.get_column("indicator_label"), new_rows.get_column("indicator_label")]).unique()
+    base_stats = pl.concat([
+        derived["base_stats"].join(keys, on=["source", "collection"], how="anti", nulls_equal=True),
+        new_rows
+    ]).sort("source", "collection", "indicator_label")
+
+    # A label's countries may come from any file holding it, but only from those
+    holders = (
+        base_stats
+        .filter(pl.col("indicator_label").is_in(labels.implode()))
+        .select("source", "collection")
+        .unique()
+        .rows()
+    )
+    new_counts = derived["sub_region_counts"].clear()
+    if holders:
+        new_counts = utils.sub_region_counts_plan(
+            nexus.filter(
+                _in_partitions(holders) &
+                pl.col("indicator_label").is_in(labels.implode()) &
+                pl.col("value").is_not_null()
+            )
+        ).collect().cast(derived["sub_region_counts"].schema)
+
+    derived = {
+        "base_stats": base_stats,
+        "sub_region_counts": pl.concat([
+            derived["sub_region_counts"].filter(~pl.col("indicator_label").is_in(labels.implode())),
+            new_counts
+        ]),
+    }
+    return _write_derived(dataset_dir, derived)
+
+
+def read_derived_metadata(dataset_dir: Union[str, Path]) -> Optional[Dict[str, pl.DataFrame]]:
+    """Stored derived metadata of a dataset, or None if it was never computed."""
+    folder = Path(dataset_dir) / DERIVED_DIR
+    paths = {name: folder / f"{name}.arrow" for name in ("base_stats", "sub_region_counts")}
+    if not all(path.exists() for path in paths.values()):
+        return None
+    return {name: pl.read_ipc(path, memory_map=False) for name, path in paths.items()}
+
+
+def indicators_metadata(
+    dataset_dir: Union[str, Path],
+    country_dim_path: Optional[Union[str, Path]] = None
+) -> pl.DataFrame:
+    """
+    `utils.create_indicators_metadata` from the stored derived metadata.
+
+    Only the (country, sub_region_name) columns are scanned, for the sub-region totals.
+    """
+    import utils
+
+    dataset_dir = Path(dataset_dir)
+    derived = read_derived_metadata(dataset_dir)
+    if derived is None:
+        derived = refresh_derived_metadata(dataset_dir, [], country_dim_path)
+    nexus = prepare_nexus(
+        scan_nexus(dataset_dir),
+        pl.scan_parquet(country_dim_path) if country_dim_path else None
+    )
+    return utils.indicators_metadata_from_parts(
+        derived["base_stats"],
+        derived["sub_region_counts"],
+        utils.get_sub_region_info(nexus)
+    )
+
+
+def _in_partitions(partitions: List[Partition]) -> pl.Expr:
+    """Rows of the given files; pruned by hive partition and file statistics, so only those files are read."""
+    return pl.any_horizontal([
+        pl.col(PARTITION_COLUMN).eq_missing(source) & pl.col("collection").eq_missing(collection)
+        for source, collection in partitions
+    ])
+
+
+def _write_derived(dataset_dir: Path, derived: Dict[str, pl.DataFrame]) -> Dict[str, pl.DataFrame]:
+    """Save the derived metadata as Arrow IPC files under `_derived/`."""
+    folder = dataset_dir / DERIVED_DIR
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, frame in derived.items():
+        tmp = folder / f"{name}.tmp"
+        frame.write_ipc(tmp)
+        tmp.replace(folder / f"{name}.arrow")
+    return derived
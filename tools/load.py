@@ -0,0 +1,125 @@
+"""Nexus loader tool implementation."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import polars as pl
+
+from .dataset import scan_nexus
+
+# Partition and sort-key columns stay String: filters on them are pushed into the scan
+# (hive and row-group statistics pruning), which a cast ahead of the filter would prevent
+SCAN_KEY_COLUMNS = ["source", "collection", "indicator_code", "country", "iso3"]
+
+INCOME_LEVELS = ["High Income", "Upper Middle Income", "Lower Middle Income", "Low Income"]
+
+
+def income_level() -> pl.Expr:
+    """Derive `income_level` from the four World Bank income classification columns."""
+    return (
+        pl.when(pl.col("high_income") == "High income")
+        .then(pl.lit("High Income"))
+        .when(pl.col("upper_middle_income") == "Upper middle income")
+        .then(pl.lit("Upper Middle Income"))
+        .when(pl.col("lower_middle_income") == "Lower middle income")
+        .then(pl.lit("Lower Middle Income"))
+        .when(pl.col("low_income") == "Low income")
+        .then(pl.lit("Low Income"))
+        .otherwise(None)
+        .cast(pl.Enum(INCOME_LEVELS))
+        .alias("income_level")
+    )
+
+
+def categorical_columns(config: Dict[str, Any]) -> List[str]:
+    """Low-cardinality string columns named in config.yaml's query column lists, except scan keys."""
+    query = config["query"]
+    columns = (
+        query["index_columns"]
+        + query["source_metadata_columns"]
+        + query["indicator_metadata_columns"]
+        + query["country_classification_columns"]
+    )
+    # de-duplicated, order kept
+    return [col for col in dict.fromkeys(columns) if col not in SCAN_KEY_COLUMNS]
+
+
+def prepare_nexus(nexus: pl.LazyFrame, country_dim: Optional[pl.LazyFrame] = None) -> pl.LazyFrame:
+    """
+    Apply the notebook's nexus transforms to a raw scan.
+
+    Parameters
+    ----------
+    nexus
+        Raw nexus LazyFrame, e.g. from `scan_nexus`.
+    country_dim
+        Country dimension to join when `nexus` is the slim fact table; `income_level` is
+        then already materialized. If None, `income_level` is derived from the row's columns.
+
+    Returns
+    -------
+    pl.LazyFrame
+        `nexus` with `country_or_area` renamed to `country` and an `income_level` Enum.
+    """
+    if country_dim is not None:
+        from .country_dim import join_country_dim
+
+        nexus = join_country_dim(nexus, country_dim)
+    else:
+        nexus = nexus.with_columns(income_level())
+    return nexus.rename({"country_or_area": "country"})
+
+
+def nexus_plan(config: Dict[str, Any], root: Path) -> pl.LazyFrame:
+    """The plan behind `load_nexus`: `prepare_nexus` over config.yaml's paths, then the categorical casts."""
+    dim_path = config["data"].get("country_dim_path")
+    nexus = prepare_nexus(
+        scan_nexus(root / config["data"]["nexus_path"]),
+        pl.scan_parquet(root / dim_path) if dim_path else None
+    )
+
+    # Only String columns are cast: year/value and the derived Enum keep their types
+    schema = nexus.collect_schema()
+    columns = [col for col in categorical_columns(config) if schema.get(col) == pl.String]
+    # Lexical ordering keeps sorts alphabetical, as they were on String columns
+    return nexus.with_columns(pl.col(columns).cast(pl.Categorical("lexical")))
+
+
+def load_nexus(config: Dict[str, Any], root: Optional[Path] = None) -> pl.LazyFrame:
+    """
+    Lazily load the nexus data with dictionary-encoded string columns.
+
+    Renames `country_or_area` to `country`, derives `income_level` as an Enum, and casts
+    the String columns named in config.yaml's query lists to Categorical, so group-bys hash
+    integers instead of strings. Partition and sort-key columns (`SCAN_KEY_COLUMNS`) stay
+    String, so filters on them still prune partitions and row groups.
+
+    Categoricals from separate loads or collects only compare and join under the global
+    string cache: callers enable it once, e.g. `pl.enable_string_cache()` in the notebook
+    setup.
+
+    When config.yaml sets `data.country_dim_path`, `nexus_path` holds the slim fact table
+    written by `split_country_dim`; the country dimension (with `income_level` already
+    materialized) is joined lazily, so unused country columns are never read.
+
+    When config.yaml sets `data.snapshot`, the same frame is read from a memory-mapped
+    Arrow IPC snapshot instead (see `load_snapshot`), rebuilt whenever the parquet changes.
+
+    Parameters
+    ----------
+    config
+        Parsed config.yaml.
+    root
+        Directory `data.nexus_path` is relative to. Defaults to the working directory.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The nexus LazyFrame used throughout the notebook.
+    """
+    root = Path.cwd() if root is None else Path(root)
+
+    if config["data"].get("snapshot"):
+        from .snapshot import load_snapshot
+
+        return load_snapshot(config, root)
+    return nexus_plan(config, root)
@@ -0,0 +1,186 @@
+"""Parallel multi-source ingest tool implementation."""
+
+import importlib
+import multiprocessing
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+import polars as pl
+
+from .dataset import staging_dir, swap_dir, update_manifest
+from .ingest import refresh_derived_metadata
+from .sketch import SKETCH_DIR, sketch_partitions
+from .sources import sink_partitions
+
+_TIMINGS_SCHEMA = {
+    "processor": pl.String,
+    "rows": pl.Int64,
+    "partitions": pl.Int64,
+    "process_s": pl.Float64,
+    "clean_s": pl.Float64,
+    "write_s": pl.Float64,
+    "wall_s": pl.Float64,
+}
+
+
+def resolve(spec: str) -> Callable[..., Any]:
+    """Import a 'module:function' processor spec."""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def run_processor(
+    name: str,
+    spec: str,
+    raw_path: Union[str, Path],
+    dataset_dir: Union[str, Path],
+    clean: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run one source processor and write its rows straight to their dataset partitions.
+
+    Runs inside a worker process. The processor is called with `raw_path` and may return a
+    pandas DataFrame, a Polars DataFrame or LazyFrame, or a tuple of them (as `process_wb`
+    does), which are stacked. `clean`, if given, is applied to each returned frame, so it
+    sees this source's rows alone. The rows are written to their partitions with
+    `sink_partitions`; for lazy processors (see `tools.sources`) that is where the raw files
+    are actually read, so their reading time is reported as `write_s`, and the rows are
+    streamed unsorted so memory stays bounded.
+
+    Returns
+    -------
+    dict
+        Timings, the row count and the (source, collection) partitions written.
+    """
+    start = time.perf_counter()
+    result = resolve(spec)(raw_path)
+    frames = list(result) if isinstance(result, tuple) else [result]
+    processed = time.perf_counter()
+
+    if clean is not None:
+        clean_fn = resolve(clean)
+        frames = [clean_fn(frame) for frame in frames]
+    cleaned = time.perf_counter()
+
+    rows = pl.concat(
+        [
+            frame.lazy() if isinstance(frame, (pl.DataFrame, pl.LazyFrame)) else pl.from_pandas(frame).lazy()
+            for frame in frames
+        ],
+        how="diagonal_relaxed"
+    )
+    # Rows already in memory are sorted for row-group pruning; lazy ones stream unsorted
+    in_memory = not any(isinstance(frame, pl.LazyFrame) for frame in frames)
+    partitions = sink_partitions(rows, dataset_dir, sort=in_memory)
+    end = time.perf_counter()
+
+    return {
+        "processor": name,
+        "rows": partitions.get_column("rows").sum(),
+        "partitions": partitions.select("source", "collection").rows(),
+        "process_s": processed - start,
+        "clean_s": cleaned - processed,
+        "write_s": end - cleaned,
+        "wall_s": end - start,
+    }
+
+
+def run_ingest(
+    processors: Dict[str, str],
+    raw_path: Union[str, Path],
+    dataset_dir: Union[str, Path],
+    clean: Optional[str] = None,
+    workers: Optional[int] = None,
+    country_dim_path: Optional[Union[str, Path]] = None
+) -> pl.DataFrame:
+    """
+    Rebuild a partitioned nexus dataset by running the source processors in parallel.
+
+    Each processor runs in its own worker process and writes its rows directly to its
+    `source=<value>` partition files, so no process ever holds the combined table. Once
+    all have finished, the parent writes the manifest, derived metadata and sketches (if
+    the dataset keeps them) for every partition written, as `ingest_partition` does.
+
+    The new dataset is built in a staging directory and replaces `dataset_dir` only once
+    all of that succeeded: partitions of sources no longer produced are dropped, and if a
+    processor fails, `dataset_dir` is left as it was.
+
+    Parameters
+    ----------
+    processors
+        Processor name → 'module:function' spec, e.g. {'isora': 'process:process_isora'}.
+    raw_path
+        Directory of raw source files, passed to every processor.
+    dataset_dir
+        Output dataset directory, read like any compacted dataset by `scan_nexus`. It is
+        replaced as a whole.
+    clean
+        Optional 'module:function' cleaning step (e.g. 'process:clean_nexus_data'), run on
+        each source's rows in its worker. It must not depend on other sources' rows.
+    workers
+        Worker processes. Defaults to one per CPU, capped at the number of processors.
+    country_dim_path
+        Country dimension, when the processors emit the slim fact layout (e.g. through
+        `clean_facts` without a dimension); the derived metadata and sketches join it.
+        Checked before any processor runs.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per processor: rows and partitions written, and time spent processing,
+        cleaning and writing.
+    """
+    dataset_dir = Path(dataset_dir)
+    if country_dim_path is not None and not Path(country_dim_path).exists():
+        raise FileNotFoundError(f"Country dimension {country_dim_path} does not exist")
+    workers = min(workers or multiprocessing.cpu_count(), len(processors)) or 1
+    staging = staging_dir(dataset_dir)
+
+    results = []
+    try:
+        # Spawned workers: forking a process that already runs Polars' thread pool can deadlock
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [
+                pool.submit(run_processor, name, spec, raw_path, staging, clean)
+                for name, spec in processors.items()
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        partitions = sorted(
+            {partition for result in results for partition in result["partitions"]},
+            key=lambda partition: (partition[0] or "", partition[1] or "")
+        )
+        update_manifest(staging, partitions)
+        refresh_derived_metadata(staging, partitions, country_dim_path)
+        if (dataset_dir / SKETCH_DIR).exists():
+            sketch_partitions(staging, partitions, country_dim_path)
+        swap_dir(staging, dataset_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return pl.DataFrame(
+        [{**result, "partitions": len(result["partitions"])} for result in results],
+        schema=_TIMINGS_SCHEMA
+    ).sort("wall_s", descending=True)
+
+
+def build_nexus(
+    config: Dict[str, Any],
+    root: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> pl.DataFrame:
+    """`run_ingest` with the processors, cleaning step and paths of config.yaml's `ingest` section."""
+    root = Path.cwd() if root is None else Path(root)
+    ingest = config["ingest"]
+    dim_path = ingest.get("country_dim_path")
+    return run_ingest(
+        ingest["processors"],
+        root / ingest["raw_path"],
+        root / ingest["dataset_dir"],
+        clean=ingest.get("clean"),
+        workers=workers,
+        country_dim_path=root / dim_path if dim_path else None
+    )
@@ -0,0 +1,283 @@
+"""Presence bitmap index tool implementation."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import numpy as np
+import polars as pl
+
+from .cache import parquet_fingerprint
+
+INDICATOR_KEYS = ["source", "collection", "indicator_label"]
+PRESENCE_FILE = "_presence.npz"
+
+
+def presence_path(data_path: Union[str, Path]) -> Path:
+    """Where the presence index of a parquet file or dataset directory is stored."""
+    data_path = Path(data_path)
+    if data_path.is_dir():
+        return data_path / PRESENCE_FILE   # not matched by the dataset's *.parquet glob
+    return data_path.with_suffix(".presence.npz")
+
+
+class PresenceIndex:
+    """
+    Packed (indicator, country, year) presence bitmaps of the nexus data.
+
+    Two boolean cubes share one layout: `rows` marks the cells holding any row and
+    `values` the cells holding a non-null value. Coverage questions then reduce to
+    `any` / `&` / `sum` over small arrays instead of scans of `value` and its null mask.
+    On disk both cubes are bit-packed, eight cells per byte. In memory they are plain
+    numpy bool arrays, one byte per cell: an opened index takes 2 × indicators × countries
+    × years bytes, eight times its stored size before compression.
+
+    Indicators are (source, collection, indicator_label) keys, as in `calculate_base_stats`;
+    countries include null when the data has rows without a country. Rows without a year
+    are not indexed.
+
+    The index describes one frame: `build` and `open` record its query plan, and `describes`
+    tells whether another frame is that same one. Coverage counted from the bitmaps is only
+    right for that frame, not for a filtered subset of it.
+
+    Parameters
+    ----------
+    indicators
+        One row per indicator key, in cube order.
+    countries
+        Country names, in cube order.
+    years
+        Years covered by the cube's last axis: a contiguous range.
+    rows, values
+        Boolean arrays of shape (indicators, countries, years).
+    fingerprint
+        Version of the data the index describes, e.g. `parquet_fingerprint(path)`.
+        Defaults to a hash of the index contents.
+
+    Examples
+    --------
+    >>> presence = PresenceIndex.open(nexus, config["data"]["nexus_path"])
+    >>> presence.countries_with_data("Population, total", years=(2000, 2010))
+    """
+
+    def __init__(
+        self,
+        indicators: pl.DataFrame,
+        countries: List[Optional[str]],
+        years: range,
+        rows: np.ndarray,
+        values: np.ndarray,
+        fingerprint: Optional[str] = None
+    ):
+        self.indicators = indicators.select(INDICATOR_KEYS).cast(pl.String)
+        self.countries = list(countries)
+        self.years = years
+        self.rows = rows
+        self.values = values
+        self.fingerprint = fingerprint or hashlib.sha256(
+            json.dumps(self._vocabulary()).encode()
+            + np.packbits(rows).tobytes()
+            + np.packbits(values).tobytes()
+        ).hexdigest()
+        self.plan: Optional[str] = None
+
+    def describes(self, df: pl.LazyFrame) -> bool:
+        """Whether the index was built or opened for `df` (the same query plan), not e.g. a subset of it."""
+        return self.plan is not None and self.plan == df.explain(optimized=False)
+
+    @classmethod
+    def build(cls, df: pl.LazyFrame, fingerprint: Optional[str] = None) -> "PresenceIndex":
+        """Build the index with one group-by over (indicator, country, year)."""
+        cells = (
+            df
+            .filter(pl.col("year").is_not_null())
+            .group_by(*INDICATOR_KEYS, "country", "year")
+            .agg(pl.col("value").is_not_null().any().alias("has_value"))
+            .with_columns(pl.col(*INDICATOR_KEYS, "country").cast(pl.String))
+            .collect()
+        )
+        indicators = cells.select(INDICATOR_KEYS).unique().sort(INDICATOR_KEYS, nulls_last=True)
+        countries = cells.get_column("country").unique().sort(nulls_last=True).to_list()
+        years = (
+            range(cells["year"].min(), cells["year"].max() + 1) if cells.height else range(0)
+        )
+
+        ids = (
+            cells
+            .join(indicators.with_row_index("indicator_id"), on=INDICATOR_KEYS, nulls_equal=True)
+            .join(
+                pl.DataFrame({"country": countries}, schema={"country": pl.String}).with_row_index("country_id"),
+                on="country",
+                nulls_equal=True
+            )
+        )
+        indicator_ids = ids["indicator_id"].to_numpy()
+        country_ids = ids["country_id"].to_numpy()
+        year_ids = (ids["year"] - years.start).to_numpy()
+
+        shape = (indicators.height, len(countries), len(years))
+        rows = np.zeros(shape, dtype=bool)
+        values = np.zeros(shape, dtype=bool)
+        rows[indicator_ids, country_ids, year_ids] = True
+        has_value = ids["has_value"].to_numpy()
+        values[indicator_ids[has_value], country_ids[has_value], year_ids[has_value]] = True
+
+        index = cls(indicators, countries, years, rows, values, fingerprint)
+        index.plan = df.explain(optimized=False)
+        return index
+
+    @classmethod
+    def open(
+        cls,
+        df: pl.LazyFrame,
+        data_path: Union[str, Path],
+        index_path: Optional[Union[str, Path]] = None,
+        country_dim_path: Optional[Union[str, Path]] = None
+    ) -> "PresenceIndex":
+        """
+        Load the index stored next to `data_path`, rebuilding it from `df` if it is stale.
+
+        Parameters
+        ----------
+        df
+            The nexus LazyFrame read from `data_path` (with `country_or_area` renamed to `country`).
+        data_path
+            config.yaml's `nexus_path`; its parquet fingerprint versions the index.
+        index_path
+            Where the index is stored. Defaults to `presence_path(data_path)`.
+        country_dim_path
+            config.yaml's `country_dim_path`, when `df` joins the country dimension: country
+            names then come from it, so its fingerprint versions the index too.
+        """
+        fingerprint = parquet_fingerprint(data_path)
+        if country_dim_path is not None:
+            fingerprint = hashlib.sha256(
+                f"{fingerprint}:{parquet_fingerprint(country_dim_path)}".encode()
+            ).hexdigest()
+        index_path = presence_path(data_path) if index_path is None else Path(index_path)
+        if index_path.exists():
+            index = cls.load(index_path)
+            if index.fingerprint == fingerprint:
+                index.plan = df.explain(optimized=False)
+                return index
+        index = cls.build(df, fingerprint)
+        index.save(index_path)
+        return index
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PresenceIndex":
+        """Read an index written by `save`."""
+        with np.load(path) as stored:
+            vocabulary = json.loads(stored["vocabulary"].tobytes())
+            shape = tuple(stored["shape"])
+            size = int(np.prod(shape))
+            rows = np.unpackbits(stored["rows"], count=size).astype(bool).reshape(shape)
+            values = np.unpackbits(stored["values"], count=size).astype(bool).reshape(shape)
+        return cls(
+            pl.DataFrame(vocabulary["indicators"], schema=INDICATOR_KEYS, orient="row"),
+            vocabulary["countries"],
+            range(*vocabulary["years"]),
+            rows,
+            values,
+            vocabulary["fingerprint"]
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the bit-packed cubes and their vocabularies to a single .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez_compressed(
+            tmp,
+            vocabulary=np.frombuffer(
+                json.dumps({**self._vocabulary(), "fingerprint": self.fingerprint}).encode(),
+                dtype=np.uint8
+            ),
+            shape=np.array(self.rows.shape),
+            rows=np.packbits(self.rows),
+            values=np.packbits(self.values),
+        )
+        tmp.replace(path)
+
+    def countries_with_data(self, indicator_label: str, years: Optional[Tuple[int, int]] = None) -> List[str]:
+        """Countries with a non-null value for an indicator, optionally within an inclusive year range."""
+        labels = self.indicators.get_column("indicator_label").to_numpy()
+        values = self.values[labels == indicator_label]
+        if years is not None:
+            start = max(years[0] - self.years.start, 0)
+            stop = max(years[1] - self.years.start + 1, 0)
+            values = values[:, :, start:stop]
+        mask = values.any(axis=(0, 2))
+        return [country for country, present in zip(self.countries, mask) if present and country is not None]
+
+    def coverage_stats(self) -> pl.DataFrame:
+        """
+        The coverage columns of `calculate_base_stats`, per indicator key.
+
+        num_countries_with_data counts countries with any row (as `n_unique` does, null
+        included); the year columns only count years with a non-null value.
+        """
+        years_with_data = self.values.any(axis=1)
+        first = years_with_data.argmax(axis=1)
+        last = years_with_data.shape[1] - 1 - years_with_data[:, ::-1].argmax(axis=1)
+        has_data = years_with_data.any(axis=1)
+        return self.indicators.with_columns(
+            pl.Series("num_countries_with_data", self.rows.any(axis=2).sum(axis=1), dtype=pl.UInt32),
+            pl.Series("num_years_with_data", years_with_data.sum(axis=1), dtype=pl.UInt32),
+            pl.Series("min_year", np.where(has_data, first + self.years.start, 0), dtype=pl.Int64),
+            pl.Series("max_year", np.where(has_data, last + self.years.start, 0), dtype=pl.Int64),
+            pl.Series("has_data", has_data),
+        ).with_columns(
+            pl.when("has_data").then(pl.col("min_year", "max_year"))
+        ).drop("has_data")
+
+    def sub_region_counts(self, geo) -> pl.DataFrame:
+        """
+        Countries with a non-null value per indicator and sub-region, as `utils.sub_region_counts_plan`.
+
+        Countries are assigned to sub-regions through `geo` (a `utils.GeographyIndex`);
+        countries in none of its sub-regions are counted under a null sub-region.
+        """
+        labels = self.indicators.get_column("indicator_label")
+        label_names = labels.unique(maintain_order=True)
+        label_ids = labels.to_frame().join(
+            label_names.to_frame().with_row_index("label_id"), on="indicator_label", nulls_equal=True
+        )["label_id"].to_numpy()
+
+        # (label, country) presence: OR over the label's indicator keys and all years
+        by_indicator = self.values.any(axis=2)
+        by_label = np.zeros((label_names.len(), len(self.countries)), dtype=bool)
+        np.logical_or.at(by_label, label_ids, by_indicator)
+
+        # (country, sub-region) membership, with a last column for unassigned countries
+        membership = np.array(
+            [[country in geo.region_countries[region] for region in geo.regions] for country in self.countries],
+            dtype=np.uint32
+        ).reshape(len(self.countries), len(geo.regions))
+        membership = np.hstack([membership, (membership.sum(axis=1) == 0)[:, None].astype(np.uint32)])
+        counts = by_label.astype(np.uint32) @ membership
+
+        regions = [geo.column_names[region] for region in geo.regions] + [None]
+        return (
+            pl.DataFrame({
+                "indicator_label": np.repeat(label_names.to_numpy(), len(regions)),
+                "sub_region_name_clean": regions * label_names.len(),
+                "countries_with_data": counts.ravel(),
+            }, schema={"indicator_label": pl.String, "sub_region_name_clean": pl.String, "countries_with_data": pl.UInt32})
+            .filter(pl.col("countries_with_data") > 0)
+        )
+
+    def _vocabulary(self) -> dict:
+        """JSON-serializable axis labels of the cubes."""
+        return {
+            "indicators": self.indicators.rows(),
+            "countries": self.countries,
+            "years": [self.years.start, self.years.stop],
+        }
+
+    def __repr__(self) -> str:
+        # Stable across processes, so results keyed on it can be cached
+        return (
+            f"PresenceIndex({self.indicators.height} indicators x {len(self.countries)} countries"
+            f" x {len(self.years)} years, fingerprint={self.fingerprint[:16]})"
+        )
@@ -0,0 +1,231 @@
+"""Opt-in profiling tool implementation."""
+
+import functools
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+import polars as pl
+
+PROFILE_ENV = "NEXUS_PROFILE"
+
+logger = logging.getLogger("nexus.profile")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_SETTINGS: Dict[str, Any] = {"enabled": False, "log_path": None, "input_rows": False}
+_RECORDS: List[Dict[str, Any]] = []
+# Profiled calls in progress in the current thread (or task), innermost last
+_ACTIVE: ContextVar[tuple] = ContextVar("nexus_profile_active", default=())
+
+
+def configure_profiling(config: Optional[Dict[str, Any]] = None, root: Optional[Path] = None) -> bool:
+    """
+    Turn profiling on or off from config.yaml's `profiling` section.
+
+    The `NEXUS_PROFILE` environment variable (1/true/yes) turns it on regardless of the config.
+    `input_rows: true` also counts the rows of LazyFrame arguments, with one extra `len`
+    query per argument and call.
+
+    Returns
+    -------
+    bool
+        Whether profiling is now enabled.
+    """
+    settings = (config or {}).get("profiling") or {}
+    root = Path.cwd() if root is None else Path(root)
+    _SETTINGS["enabled"] = bool(settings.get("enabled", False))
+    _SETTINGS["log_path"] = root / settings["log_path"] if settings.get("log_path") else None
+    _SETTINGS["input_rows"] = bool(settings.get("input_rows", False))
+    return profiling_enabled()
+
+
+def profiling_enabled() -> bool:
+    """Whether profiled calls are currently recorded."""
+    return _SETTINGS["enabled"] or os.environ.get(PROFILE_ENV, "").lower() in {"1", "true", "yes"}
+
+
+def profiled(fn: F) -> F:
+    """
+    Record timings, plans, row counts and memory of each call to `fn` while profiling is on.
+
+    Queries the call runs through `collect` (below) run as `LazyFrame.profile`, so the
+    record holds each query's optimized plan and per-node timings; the time spent outside
+    those collects (e.g. `filter_pivot`'s eager pivot) is reported as `outside_collect_s`.
+    Calls are tracked per thread, so concurrent callers (e.g. marimo cells) get their own
+    records. With profiling off, the call goes straight through.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not profiling_enabled():
+            return fn(*args, **kwargs)
+
+        active = _ACTIVE.get()
+        record: Dict[str, Any] = {
+            "function": name,
+            "parent": active[-1]["function"] if active else None,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "input_rows": _input_rows(args, kwargs),
+            "collects": [],
+        }
+        token = _ACTIVE.set((*active, record))
+        rss_before = _peak_rss_bytes()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            record["wall_s"] = time.perf_counter() - start
+            _ACTIVE.reset(token)
+        record["outside_collect_s"] = record["wall_s"] - sum(c["wall_s"] for c in record["collects"])
+        record["output_rows"] = _height(result)
+        record["peak_rss_bytes"] = _peak_rss_bytes()
+        record["peak_rss_growth_bytes"] = record["peak_rss_bytes"] - rss_before
+        _emit(record)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def collect(lf: pl.LazyFrame, **kwargs: Any) -> pl.DataFrame:
+    """
+    `lf.collect(**kwargs)`, profiled into the innermost profiled call of this thread, if any.
+
+    Profiled functions run their queries through it, e.g. `plan.pipe(collect)`.
+    """
+    active = _ACTIVE.get()
+    if not active:
+        return lf.collect(**kwargs)
+    plan = lf.explain(**{k: v for k, v in kwargs.items() if k == "engine"})
+    start = time.perf_counter()
+    df, nodes = lf.profile(**kwargs)
+    wall = time.perf_counter() - start
+    active[-1]["collects"].append({
+        "plan": plan,
+        "wall_s": wall,
+        "nodes": nodes.rename({"start": "start_us", "end": "end_us"}).to_dicts(),
+    })
+    return df
+
+
+def collect_all(lfs: List[pl.LazyFrame], **kwargs: Any) -> List[pl.DataFrame]:
+    """
+    `pl.collect_all(lfs, **kwargs)`, profiled like `collect`.
+
+    Inside a profiled call the queries run one at a time through `collect`, so each gets
+    its own plan and timings but they no longer share scans.
+    """
+    if not _ACTIVE.get():
+        return pl.collect_all(lfs, **kwargs)
+    return [collect(lf, **kwargs) for lf in lfs]
+
+
+def profile_records() -> List[Dict[str, Any]]:
+    """Every record captured in this session, oldest first."""
+    return list(_RECORDS)
+
+
+def profile_report() -> pl.DataFrame:
+    """One row per profiled call: wall time, time outside collects, rows and memory."""
+    return pl.DataFrame(
+        [
+            {
+                "function": record["function"],
+                "parent": record["parent"],
+                "started_at": record["started_at"],
+                "wall_s": record["wall_s"],
+                "collects": len(record["collects"]),
+                "collect_s": record["wall_s"] - record["outside_collect_s"],
+                "outside_collect_s": record["outside_collect_s"],
+                "input_rows": sum(record["input_rows"].values()) if record["input_rows"] else None,
+                "output_rows": record["output_rows"],
+                "peak_rss_mib": record["peak_rss_bytes"] / 1024**2,
+            }
+            for record in _RECORDS
+        ],
+        schema={
+            "function": pl.String, "parent": pl.String, "started_at": pl.String,
+            "wall_s": pl.Float64, "collects": pl.Int64, "collect_s": pl.Float64,
+            "outside_collect_s": pl.Float64, "input_rows": pl.Int64, "output_rows": pl.Int64,
+            "peak_rss_mib": pl.Float64,
+        },
+    )
+
+
+def profile_nodes() -> pl.DataFrame:
+    """One row per query-plan node timed by `LazyFrame.profile`, across all records."""
+    rows = [
+        {"function": record["function"], "collect": i, **node}
+        for record in _RECORDS
+        for i, collect in enumerate(record["collects"])
+        for node in collect["nodes"]
+    ]
+    return pl.DataFrame(
+        rows,
+        schema={"function": pl.String, "collect": pl.Int64, "node": pl.String, "start_us": pl.Int64, "end_us": pl.Int64},
+    ).with_columns((pl.col("end_us") - pl.col("start_us")).alias("duration_us"))
+
+
+def profile_panel():
+    """marimo panel of the captured records: calls, plan nodes and optimized plans."""
+    import marimo as mo
+
+    plans = {
+        f"{i}. {record['function']} (collect {j})": mo.md(f"```\n{collect['plan']}\n```")
+        for i, record in enumerate(_RECORDS)
+        for j, collect in enumerate(record["collects"])
+    }
+    return mo.ui.tabs({
+        "Calls": mo.ui.table(profile_report(), selection=None),
+        "Plan nodes": mo.ui.table(profile_nodes(), selection=None),
+        "Plans": mo.accordion(plans) if plans else mo.md("No collects recorded."),
+    })
+
+
+def clear_profile() -> None:
+    """Forget the records captured so far."""
+    _RECORDS.clear()
+
+
+def _input_rows(args: tuple, kwargs: dict) -> Dict[str, int]:
+    """Row counts of the frame arguments (LazyFrames only with `input_rows`: a `len` query each)."""
+    counts = {}
+    for key, value in [*enumerate(args), *kwargs.items()]:
+        if isinstance(value, pl.LazyFrame) and _SETTINGS["input_rows"]:
+            counts[str(key)] = value.select(pl.len()).collect().item()
+        elif isinstance(value, pl.DataFrame):
+            counts[str(key)] = value.height
+    return counts
+
+
+def _height(result: Any) -> Optional[int]:
+    """Rows of a result, if it is (or wraps) a DataFrame."""
+    if isinstance(result, pl.DataFrame):
+        return result.height
+    data = getattr(result, "data", None)    # e.g. a styled mo.ui.table
+    return data.height if isinstance(data, pl.DataFrame) else None
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident set size of the process so far (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    """Keep a record, log it as one JSON line, and append it to the configured log file."""
+    _RECORDS.append(record)
+    line = json.dumps(record, default=str)
+    logger.info(line)
+    log_path: Union[Path, None] = _SETTINGS["log_path"]
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "a") as f:
+            f.write(line + "\n")
@@ -0,0 +1,270 @@
+"""Mergeable statistics sketch tool implementation."""
+
+import math
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+import polars as pl
+
+from .dataset import PARTITION_COLUMN, Partition, partition_file, read_manifest, scan_nexus
+from .load import prepare_nexus
+from .profiling import collect_all
+
+STATS_KEYS = ["source", "collection", "indicator_label"]
+SKETCH_DIR = Path("_derived") / "sketches"
+
+# HyperLogLog with 2**12 registers: ~1.6% standard error on distinct counts
+HLL_PRECISION = 12
+# Log-bucket quantile sketch (DDSketch): estimates within 0.5% of the true value
+QUANTILE_ACCURACY = 0.005
+
+_GAMMA = (1 + QUANTILE_ACCURACY) / (1 - QUANTILE_ACCURACY)
+_DISTINCT_COLUMNS = {
+    "num_countries_with_data": (pl.col("country"), None),
+    "num_years_with_data": (pl.col("year"), pl.col("value").is_not_null()),
+}
+_FRAMES = ("aggregates", "distinct", "quantiles")
+
+
+class StatsSketch:
+    """
+    Mergeable summary of the nexus rows behind `calculate_base_stats`, per indicator key.
+
+    Three tables make up the sketch, each of which merges by a plain group-by:
+
+    - `aggregates`: row and null counts, value sum and count, min/max value and year
+      (merged with sum / min / max, so these stay exact);
+    - `distinct`: HyperLogLog registers for the distinct country and year counts
+      (merged with max);
+    - `quantiles`: log-spaced value buckets with counts for the median and IQR
+      (merged with sum).
+
+    A sketch per dataset partition can be stored with `save`, and the statistics of the
+    whole dataset merged from them with `StatsSketch.merge(...).finalize()`, without
+    reading any rows.
+
+    Parameters
+    ----------
+    aggregates, distinct, quantiles
+        The sketch tables, as built by `build`.
+    """
+
+    def __init__(self, aggregates: pl.DataFrame, distinct: pl.DataFrame, quantiles: pl.DataFrame):
+        self.aggregates = aggregates
+        self.distinct = distinct
+        self.quantiles = quantiles
+
+    @classmethod
+    def build(cls, df: pl.LazyFrame, distinct: bool = True) -> "StatsSketch":
+        """
+        Sketch a nexus LazyFrame (with `country`, as returned by `load_nexus`).
+
+        With `distinct=False` the HyperLogLog registers are skipped, e.g. when the
+        coverage columns come from a presence index instead.
+        """
+        # Keys as strings, so sketches of separately loaded partitions merge
+        df = df.with_columns(pl.col(STATS_KEYS).cast(pl.String))
+        value = pl.col("value")
+        plans = [
+            df.group_by(STATS_KEYS).agg(
+                count_rows=pl.len(),
+                count_missing_value=value.null_count(),
+                value_sum=value.sum(),
+                value_count=value.count(),
+                min_value=value.min(),
+                max_value=value.max(),
+                min_year=pl.col("year").filter(value.is_not_null()).min(),
+                max_year=pl.col("year").filter(value.is_not_null()).max(),
+            ),
+            pl.concat([
+                _hll_registers(df, column, expr, where) for column, (expr, where) in _DISTINCT_COLUMNS.items()
+            ]) if distinct else pl.LazyFrame(schema=_DISTINCT_SCHEMA),
+            df.filter(value.is_not_null())
+            .group_by(*STATS_KEYS, sign=value.sign().cast(pl.Int8), bucket=_bucket(value))
+            .agg(count=pl.len()),
+        ]
+        return cls(*collect_all(plans))
+
+    @classmethod
+    def merge(cls, sketches: Iterable["StatsSketch"]) -> "StatsSketch":
+        """Combine sketches of disjoint row sets into the sketch of their union."""
+        sketches = list(sketches)
+        aggregates = pl.concat([sketch.aggregates for sketch in sketches]).group_by(STATS_KEYS).agg(
+            pl.col("count_rows", "count_missing_value", "value_sum", "value_count").sum(),
+            pl.col("min_value", "min_year").min(),
+            pl.col("max_value", "max_year").max(),
+        )
+        distinct = pl.concat([sketch.distinct for sketch in sketches]).group_by(
+            *STATS_KEYS, "column", "register"
+        ).agg(pl.col("rank").max())
+        quantiles = pl.concat([sketch.quantiles for sketch in sketches]).group_by(
+            *STATS_KEYS, "sign", "bucket"
+        ).agg(pl.col("count").sum())
+        return cls(aggregates, distinct, quantiles)
+
+    def finalize(self) -> pl.DataFrame:
+        """
+        The `calculate_base_stats` columns estimated from the sketch.
+
+        Counts, mean, min/max and the year range are exact; the median and IQR are within
+        `QUANTILE_ACCURACY` relative error, the distinct counts HyperLogLog estimates.
+        Keys are strings.
+        """
+        registers = 2 ** HLL_PRECISION
+        alpha = 0.7213 / (1 + 1.079 / registers)
+        distinct = (
+            self.distinct
+            .group_by(*STATS_KEYS, "column")
+            .agg(
+                harmonic=(2.0 ** -pl.col("rank").cast(pl.Float64)).sum() + (registers - pl.len()),
+                empty=registers - pl.len(),
+            )
+            .with_columns(estimate=alpha * registers ** 2 / pl.col("harmonic"))
+            .with_columns(
+                # Linear counting in the small range, where raw HyperLogLog is biased
+                pl.when((pl.col("estimate") <= 2.5 * registers) & (pl.col("empty") > 0))
+                .then(registers * (registers / pl.col("empty").cast(pl.Float64)).log())
+                .otherwise(pl.col("estimate"))
+                .round()
+                .cast(pl.UInt32)
+                .alias("estimate")
+            )
+            .pivot(on="column", index=STATS_KEYS, values="estimate")
+        )
+
+        # The bucket holding the element of rank q * (n - 1), as in `quantile(q, "nearest")`
+        rank_reached = lambda q: pl.col("count").cum_sum() > q * (pl.col("count").sum() - 1)
+        quantiles = (
+            self.quantiles
+            .with_columns(
+                representative=pl.col("sign") * 2 * _GAMMA ** pl.col("bucket").cast(pl.Float64) / (_GAMMA + 1)
+            )
+            .sort("representative")
+            .group_by(STATS_KEYS)
+            .agg([
+                pl.col("representative").filter(rank_reached(q)).first().alias(name)
+                for q, name in [(0.25, "q25"), (0.5, "median_value"), (0.75, "q75")]
+            ])
+        )
+
+        stats = (
+            self.aggregates
+            .join(quantiles, on=STATS_KEYS, how="left", nulls_equal=True)
+            .with_columns(
+                mean_value=pl.col("value_sum") / pl.col("value_count"),
+                iqr_value=pl.col("q75") - pl.col("q25"),
+                pct_missing_value=pl.col("count_missing_value") / pl.col("count_rows") * 100,
+            )
+        )
+        if self.distinct.height:
+            stats = stats.join(distinct, on=STATS_KEYS, how="left", nulls_equal=True).with_columns(
+                pl.col(list(_DISTINCT_COLUMNS)).fill_null(0)
+            )
+        columns = [
+            *STATS_KEYS, "count_rows", "count_missing_value",
+            *(list(_DISTINCT_COLUMNS) if self.distinct.height else []),
+            "mean_value", "median_value", "min_value", "max_value", "iqr_value",
+            "min_year", "max_year", "pct_missing_value",
+        ]
+        return stats.select(columns).sort(STATS_KEYS)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "StatsSketch":
+        """Read a sketch written by `save`."""
+        path = Path(path)
+        return cls(*[pl.read_ipc(path / f"{name}.arrow", memory_map=False) for name in _FRAMES])
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the sketch tables as Arrow IPC files into the directory `path`."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in _FRAMES:
+            tmp = path / f"{name}.tmp"
+            getattr(self, name).write_ipc(tmp)
+            tmp.replace(path / f"{name}.arrow")
+
+
+_DISTINCT_SCHEMA = {
+    **{key: pl.String for key in STATS_KEYS},
+    "column": pl.String,
+    "register": pl.UInt64,
+    "rank": pl.UInt32,
+}
+
+
+def _hll_registers(df: pl.LazyFrame, column: str, expr: pl.Expr, where: Optional[pl.Expr]) -> pl.LazyFrame:
+    """HyperLogLog registers of `expr` per indicator key: the max rank seen per register."""
+    tail_bits = 64 - HLL_PRECISION
+    # Hash strings rather than categorical codes, which differ between loads
+    hashed = expr.cast(pl.String).hash(seed=0)
+    tail = hashed % 2 ** tail_bits
+    if where is not None:
+        df = df.filter(where)
+    return (
+        df
+        .group_by(
+            *STATS_KEYS,
+            register=hashed // 2 ** tail_bits,
+        )
+        # Rank: position of the first 1-bit in the hash bits after the register index
+        .agg(rank=(tail.bitwise_leading_zeros() - HLL_PRECISION + 1).max())
+        .select(*STATS_KEYS, pl.lit(column).alias("column"), "register", "rank")
+        .cast(_DISTINCT_SCHEMA)
+    )
+
+
+def _bucket(value: pl.Expr) -> pl.Expr:
+    """Log-spaced bucket index of |value|, 0 for zeros."""
+    return (
+        pl.when(value != 0)
+        .then((value.abs().log() / math.log(_GAMMA)).ceil())
+        .otherwise(0)
+        .cast(pl.Int32)
+    )
+
+
+def sketch_path(dataset_dir: Union[str, Path], source: Optional[str], collection: Optional[str]) -> Path:
+    """Directory holding the stored sketch of one partition file."""
+    dataset_dir = Path(dataset_dir)
+    return dataset_dir / SKETCH_DIR / partition_file("", source, collection).with_suffix("")
+
+
+def sketch_partitions(
+    dataset_dir: Union[str, Path],
+    partitions: Optional[List[Partition]] = None,
+    country_dim_path: Optional[Union[str, Path]] = None
+) -> None:
+    """
+    Build and store the sketch of each partition file of a dataset.
+
+    Parameters
+    ----------
+    dataset_dir
+        A dataset directory written by `compact_nexus`.
+    partitions
+        (source, collection) pairs to (re)sketch. Defaults to every partition in the manifest.
+    country_dim_path
+        Country dimension to join when the dataset is the slim fact layout.
+    """
+    dataset_dir = Path(dataset_dir)
+    if partitions is None:
+        partitions = read_manifest(dataset_dir).select("source", "collection").rows()
+    nexus = prepare_nexus(
+        scan_nexus(dataset_dir),
+        pl.scan_parquet(country_dim_path) if country_dim_path else None
+    )
+    for source, collection in partitions:
+        part = nexus.filter(
+            pl.col(PARTITION_COLUMN).eq_missing(source) &
+            pl.col("collection").eq_missing(collection)
+        )
+        StatsSketch.build(part).save(sketch_path(dataset_dir, source, collection))
+
+
+def dataset_base_stats(dataset_dir: Union[str, Path]) -> pl.DataFrame:
+    """Approximate `calculate_base_stats` of a whole dataset, merged from its stored partition sketches."""
+    dataset_dir = Path(dataset_dir)
+    partitions = read_manifest(dataset_dir).select("source", "collection").rows()
+    return StatsSketch.merge(
+        StatsSketch.load(sketch_path(dataset_dir, source, collection))
+        for source, collection in partitions
+    ).finalize()
@@ -0,0 +1,231 @@
+"""Lazy source ingest tool implementation."""
+
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import polars as pl
+
+from .country_dim import FACT_COLUMNS, FACT_SORT_COLUMNS, join_country_dim
+from .dataset import PARTITION_COLUMN, ROW_GROUP_SIZE, SORT_COLUMNS, partition_file, staging_dir
+
+# Columns whose surrounding whitespace and empty strings the raw files are inconsistent about
+_TEXT_COLUMNS = ["iso3", "source", "database", "collection", "indicator_code", "indicator_label", "value_meta"]
+
+
+def scan_raw(path: Union[str, Path], sheet_name: Optional[str] = None, **kwargs) -> pl.LazyFrame:
+    """
+    Lazily scan one raw source file by its extension.
+
+    CSV/TSV, parquet and Arrow IPC files are streamed. Excel workbooks cannot be read in
+    pieces: the sheet is read whole (with Polars' calamine reader, which needs `fastexcel`)
+    and then handled lazily, so memory is bounded by the sheet rather than the pipeline.
+    Extra keyword arguments go to the underlying `scan_*`/`read_excel` call.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in {".csv", ".tsv", ".txt"}:
+        return pl.scan_csv(path, separator="\t" if suffix == ".tsv" else ",", infer_schema=False, **kwargs)
+    if suffix == ".parquet":
+        return pl.scan_parquet(path, **kwargs)
+    if suffix in {".arrow", ".ipc", ".feather"}:
+        return pl.scan_ipc(path, **kwargs)
+    if suffix in {".xlsx", ".xlsm", ".xls"}:
+        return pl.read_excel(path, sheet_name=sheet_name, infer_schema_length=0, **kwargs).lazy()
+    raise ValueError(f"Unsupported raw file type: {path}")
+
+
+def unpivot_years(raw: pl.LazyFrame, index: List[str]) -> pl.LazyFrame:
+    """
+    Turn a wide table with one column per year (World Bank and UNODC downloads) into long rows.
+
+    Every column whose name is a year ("1960", or "1960 [YR1960]" in WDI extracts) becomes
+    a `year`/`value` row; `index` columns are kept as they are.
+    """
+    year_columns = [
+        col for col in raw.collect_schema().names()
+        if col not in index and col[:4].isdigit()
+    ]
+    return (
+        raw
+        .unpivot(on=year_columns, index=index, variable_name="year", value_name="value")
+        .with_columns(pl.col("year").str.slice(0, 4))
+    )
+
+
+def to_fact_layout(
+    raw: pl.LazyFrame,
+    source: str,
+    database: str,
+    collection: Optional[str] = None,
+    columns: Optional[Dict[str, str]] = None
+) -> pl.LazyFrame:
+    """
+    Map a processed raw frame onto the slim fact layout (`FACT_COLUMNS`).
+
+    Parameters
+    ----------
+    raw
+        Long rows, one per country, year and indicator.
+    source, database, collection
+        Constant metadata for the rows; a `collection` column in `raw` is kept if None.
+    columns
+        Raw column → fact column renames, e.g. {'Country Code': 'iso3', 'Series Code':
+        'indicator_code'}. Fact columns still missing afterwards are filled with nulls.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The rows with exactly `FACT_COLUMNS`, still as typed in `raw`; `clean_facts`
+        parses them.
+    """
+    lf = raw.rename(columns or {})
+    names = lf.collect_schema().names()
+    constants = {"source": source, "database": database}
+    if collection is not None or "collection" not in names:
+        constants["collection"] = collection
+    return (
+        lf
+        .with_columns(pl.lit(value, pl.String).alias(name) for name, value in constants.items())
+        .with_columns(
+            pl.lit(None, pl.String).alias(col)
+            for col in FACT_COLUMNS if col not in names and col not in constants
+        )
+        .select(FACT_COLUMNS)
+    )
+
+
+def clean_facts(facts: pl.LazyFrame, country_dim: Optional[Union[pl.LazyFrame, pl.DataFrame]] = None) -> pl.LazyFrame:
+    """
+    Lazy cleaning stage for fact rows from `to_fact_layout`.
+
+    Trims text columns and turns empty strings into nulls, parses values that the raw files
+    write as text (World Bank's ".." for missing becomes null), and drops rows without an
+    indicator code or year. Every step is row-local, so the stage streams.
+
+    Parameters
+    ----------
+    facts
+        Fact rows of one or more sources.
+    country_dim
+        Country dimension (see `build_country_dim`). If given, its attributes are joined on
+        iso3 to give the full raw nexus layout; otherwise rows stay in the slim fact layout
+        read with config.yaml's `country_dim_path`.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The cleaned rows.
+    """
+    schema = facts.collect_schema()
+    text = [col for col in _TEXT_COLUMNS if schema.get(col) == pl.String]
+    cleaned = (
+        facts
+        .with_columns(pl.col(text).str.strip_chars())
+        .with_columns(pl.when(pl.col(text) != "").then(pl.col(text)))   # `replace` would not stream
+        .with_columns(
+            _parse(schema, "year", pl.Int64),
+            _parse(schema, "value", pl.Float64),
+        )
+        .filter(pl.col("indicator_code").is_not_null() & pl.col("year").is_not_null())
+    )
+    if country_dim is None:
+        return cleaned
+    return join_country_dim(cleaned, country_dim.lazy().drop("income_level", strict=False))
+
+
+def _parse(schema: pl.Schema, column: str, dtype: pl.DataType) -> pl.Expr:
+    """Cast a column to `dtype`, parsing it (unparseable text becomes null) if it is text."""
+    expr = pl.col(column)
+    if schema.get(column) == pl.String:
+        expr = expr.str.strip_chars()
+    return expr.cast(dtype, strict=False)
+
+
+def sink_partitions(
+    rows: pl.LazyFrame,
+    dataset_dir: Union[str, Path],
+    sort: bool = False,
+    row_group_size: int = ROW_GROUP_SIZE,
+    sort_by: Optional[List[str]] = None
+) -> pl.DataFrame:
+    """
+    Stream rows into their dataset partition files in a single pass.
+
+    Each (source, collection) is written to its `partition_file`, with the `source` column
+    left to the hive directory. Without `sort` the rows stream through in input order and
+    memory stays bounded whatever the input size. Files are written in a staging directory
+    next to `dataset_dir` and renamed into place once the whole sink has finished, so an
+    interrupted run never leaves truncated partition files behind.
+
+    Parameters
+    ----------
+    rows
+        Rows in the raw nexus or slim fact layout.
+    dataset_dir
+        Dataset directory to write into.
+    sort
+        Sort each file's rows like `write_partition_file` does, for tighter row-group
+        statistics. The sort holds the rows of every partition in memory until the end,
+        so use it for frames that are in memory anyway, or run `compact_nexus` over the
+        dataset afterwards.
+    row_group_size
+        Rows per row group.
+    sort_by
+        Sort order with `sort`. Defaults to `SORT_COLUMNS`, or `FACT_SORT_COLUMNS` for
+        rows in the slim fact layout.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per partition written: `source`, `collection` and `rows`. Pass its
+        (source, collection) rows to `update_manifest`.
+    """
+    # The partitioned sink cannot write Null-typed (all-null) columns
+    rows = rows.with_columns(pl.col(pl.Null).cast(pl.String))
+    per_partition_sort_by = None
+    if sort:
+        if sort_by is None:
+            names = rows.collect_schema().names()
+            sort_by = SORT_COLUMNS if "country_or_area" in names else FACT_SORT_COLUMNS
+        # Nulls last, as `write_partition_file` sorts them
+        per_partition_sort_by = [expr for col in sort_by for expr in (pl.col(col).is_null(), pl.col(col))]
+    written: List[pl.DataFrame] = []
+
+    def file_path(context) -> Path:
+        keys = {key.name: key.raw_value for key in context.keys}
+        return partition_file(".", keys[PARTITION_COLUMN], keys["__collection"])
+
+    dataset_dir = Path(dataset_dir)
+    staging = staging_dir(dataset_dir)
+    try:
+        rows.sink_parquet(
+            pl.PartitionByKey(
+                staging,
+                file_path=file_path,
+                by={PARTITION_COLUMN: pl.col(PARTITION_COLUMN), "__collection": pl.col("collection")},
+                include_key=False,   # drops `source` only; `collection` stays in the file
+                per_partition_sort_by=per_partition_sort_by,
+                finish_callback=written.append,
+            ),
+            row_group_size=row_group_size,
+            statistics=True,
+            compression="zstd",
+            mkdir=True,
+            engine="streaming",
+        )
+        partitions = (
+            written[0]
+            .select(
+                pl.col("keys").struct.field(PARTITION_COLUMN).alias("source"),
+                pl.col("keys").struct.field("__collection").alias("collection"),
+                pl.col("num_rows").cast(pl.Int64).alias("rows"),
+            )
+            .sort("source", "collection", nulls_last=True)
+        )
+        for source, collection in partitions.select("source", "collection").iter_rows():
+            path = partition_file(dataset_dir, source, collection)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partition_file(staging, source, collection).replace(path)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return partitions
@@ -0,0 +1,147 @@
+"""Sparse pivot output tool implementation."""
+
+from typing import List, Optional
+import numpy as np
+import polars as pl
+
+INDEX_COLUMNS = ["country", "year"]
+
+
+class SparsePivot:
+    """
+    A `filter_pivot` result stored in compressed sparse row (CSR) form.
+
+    Rows are the (country, year) pairs and columns the indicators, both in the order the
+    wide pivot would give them. Only the non-null cells are stored: the values of row `i`
+    are `values[indptr[i]:indptr[i + 1]]`, in the columns `indices[indptr[i]:indptr[i + 1]]`.
+    Memory is proportional to the non-null values, not to rows × indicators.
+
+    Parameters
+    ----------
+    rows
+        The `country` and `year` of each row, in row order.
+    columns
+        Indicator names, in column order.
+    indptr
+        Int64 array of length len(rows) + 1: where each row's cells start in `indices`/`values`.
+    indices
+        Int64 array of the column of each stored cell.
+    values
+        Float64 array of the stored values.
+
+    Examples
+    --------
+    >>> sparse = filter_pivot(nexus, config["query"]["index_columns"], sparse=True)
+    >>> sparse.densify(["Population, total", "GDP (current US$)"])
+    """
+
+    def __init__(
+        self,
+        rows: pl.DataFrame,
+        columns: List[Optional[str]],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        values: np.ndarray
+    ):
+        self.rows = rows
+        self.columns = list(columns)
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+
+    @classmethod
+    def from_long(cls, long: pl.DataFrame, ind_col: str) -> "SparsePivot":
+        """Build from the long (country, year, indicator, value) rows `filter_pivot` selects."""
+        # pivot's "first" per cell; a null first value leaves the cell empty, as in the wide frame
+        cells = long.group_by([*INDEX_COLUMNS, ind_col], maintain_order=True).agg(pl.col("value").first())
+        rows = cells.select(INDEX_COLUMNS).unique(maintain_order=True)
+        columns = cells.get_column(ind_col).unique(maintain_order=True)
+
+        stored = (
+            cells
+            .filter(pl.col("value").is_not_null())
+            .join(rows.with_row_index("row"), on=INDEX_COLUMNS, nulls_equal=True)
+            .join(columns.to_frame().with_row_index("column"), on=ind_col, nulls_equal=True)
+            .sort("row", "column")
+        )
+        counts = np.bincount(stored.get_column("row").to_numpy(), minlength=rows.height)
+        return cls(
+            rows,
+            columns.to_list(),
+            np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            stored.get_column("column").to_numpy().astype(np.int64),
+            stored.get_column("value").cast(pl.Float64).to_numpy(),
+        )
+
+    @property
+    def shape(self) -> tuple:
+        """(rows, indicator columns) of the equivalent wide frame."""
+        return (self.rows.height, len(self.columns))
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored (non-null) cells."""
+        return len(self.values)
+
+    @property
+    def density(self) -> float:
+        """Share of the wide frame's indicator cells that hold a value."""
+        cells = self.shape[0] * self.shape[1]
+        return self.nnz / cells if cells else 0.0
+
+    def to_long(self) -> pl.DataFrame:
+        """The stored cells as (country, year, indicator, value) rows, in row order."""
+        row_ids = np.repeat(np.arange(self.rows.height), np.diff(self.indptr))
+        return pl.concat(
+            [
+                self.rows[row_ids],
+                pl.DataFrame({
+                    "indicator": pl.Series(self.columns, dtype=pl.String)[self.indices],
+                    "value": self.values,
+                }),
+            ],
+            how="horizontal",
+        )
+
+    def densify(self, columns: Optional[List[Optional[str]]] = None) -> pl.DataFrame:
+        """
+        The wide `filter_pivot` frame, restricted to `columns`.
+
+        Parameters
+        ----------
+        columns
+            Indicators to include, in this order. Defaults to all of them, which gives the
+            full wide frame; pick the ones a table or chart actually shows.
+
+        Returns
+        -------
+        pl.DataFrame
+            `country`, `year` and one Float64 column per selected indicator.
+        """
+        import pyarrow as pa
+
+        positions = {name: j for j, name in enumerate(self.columns)}
+        selected = self.columns if columns is None else columns
+        missing = [name for name in selected if name not in positions]
+        if missing:
+            raise KeyError(f"Indicators not in the pivot: {missing}")
+
+        # Cells grouped by column once, so each selected column is a slice
+        row_ids = np.repeat(np.arange(self.rows.height, dtype=np.int64), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(np.bincount(self.indices, minlength=len(self.columns)))])
+        series = []
+        for name in selected:
+            cells = order[starts[positions[name]]:starts[positions[name] + 1]]
+            data = np.zeros(self.rows.height)
+            data[row_ids[cells]] = self.values[cells]
+            absent = np.ones(self.rows.height, dtype=bool)
+            absent[row_ids[cells]] = False
+            series.append(pl.Series("null" if name is None else str(name), pa.array(data, mask=absent)))
+        return self.rows.with_columns(series)
+
+    def __repr__(self) -> str:
+        return (
+            f"SparsePivot({self.shape[0]} rows × {self.shape[1]} indicators, "
+            f"{self.nnz} values, density {self.density:.1%})"
+        )
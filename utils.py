@@ -1,10 +1,90 @@
 """Utility functions for nexus indicators metadata analysis."""
 
+import hashlib
+from typing import TYPE_CHECKING, Mapping
+
 import polars as pl
 
+from tools.profiling import collect, profiled
+
+if TYPE_CHECKING:
+    from tools.presence import PresenceIndex
+
+# calculate_base_stats columns a PresenceIndex can answer without scanning `value`
+COVERAGE_COLUMNS = ["num_countries_with_data", "num_years_with_data", "min_year", "max_year"]
+
+
+class GeographyIndex:
+   """
+   Sub-region → country sets, country totals and sanitized column names, built once.
+
+   Build it with `geography_index` (memoized per dataset version) and pass it to
+   `get_sub_region_info`, `calculate_sub_region_coverage` and `create_indicators_metadata`
+   so repeated calls, e.g. on filtered subsets, never rescan the country dimension.
+   """
+
+   def __init__(self, region_countries: Mapping[str, frozenset]):
+       self.region_countries = dict(region_countries)
+       self.regions = list(self.region_countries)
+       self.totals = {region: len(countries) for region, countries in self.region_countries.items()}
+       self.column_names = {region: region.replace(" ", "_") for region in self.regions}
+       self.fingerprint = hashlib.sha256(repr(sorted(
+           (region, sorted(countries)) for region, countries in self.region_countries.items()
+       )).encode()).hexdigest()
+
+   @classmethod
+   def from_sub_region_info(cls, sub_region_info: pl.DataFrame) -> "GeographyIndex":
+       """Build the index from a `get_sub_region_info` table."""
+       return cls({
+           region: frozenset(countries)
+           for region, countries in sub_region_info.select("sub_region_name", "countries").rows()
+       })
+
+   def to_frame(self) -> pl.DataFrame:
+       """The index as a `get_sub_region_info` table."""
+       return pl.DataFrame(
+           {
+               "sub_region_name": self.regions,
+               "total_countries": [self.totals[region] for region in self.regions],
+               "countries": [sorted(self.region_countries[region]) for region in self.regions],
+           },
+           schema_overrides={"total_countries": pl.UInt32}
+       )
+
+   def __repr__(self) -> str:
+       # Stable across processes (unlike set ordering), so results keyed on it can be cached
+       return f"GeographyIndex({len(self.regions)} sub-regions, fingerprint={self.fingerprint[:16]})"
+
+
+_GEOGRAPHY_INDEXES: dict[str, GeographyIndex] = {}
+_GEOGRAPHY_INDEXES_KEPT = 8
 
-def get_sub_region_info(df: pl.LazyFrame) -> pl.DataFrame:
-    """Get sub-region information with total countries per region."""
+
+def geography_index(df: pl.LazyFrame, version: str) -> GeographyIndex:
+   """
+   Memoized GeographyIndex of `df`, built with one scan per dataset version.
+
+   `version` identifies the data, e.g. `tools.parquet_fingerprint(path)`, so a changed
+   parquet gets a fresh index. It is required: a query plan does not identify the data of
+   in-memory frames. Only the most recently built versions are kept.
+   """
+   if version not in _GEOGRAPHY_INDEXES:
+       while len(_GEOGRAPHY_INDEXES) >= _GEOGRAPHY_INDEXES_KEPT:
+           del _GEOGRAPHY_INDEXES[next(iter(_GEOGRAPHY_INDEXES))]
+       _GEOGRAPHY_INDEXES[version] = GeographyIndex.from_sub_region_info(get_sub_region_info(df))
+   return _GEOGRAPHY_INDEXES[version]
+
+
+@profiled
+def get_sub_region_info(df: pl.LazyFrame, geo: GeographyIndex | None = None) -> pl.DataFrame:
+    """Get sub-region information with total countries per region (from `geo` without scanning, if given)."""
+    if geo is not None:
+        return geo.to_frame()
+    return collect(sub_region_info_plan(df))
+
+
+def sub_region_info_plan(df: pl.LazyFrame) -> pl.LazyFrame:
+    """Lazy plan behind get_sub_region_info."""
     return (
         df
         .select(["country", "sub_region_name"])
@@ -15,12 +95,61 @@ def get_sub_region_info(df: pl.LazyFrame) -> pl.DataFrame:
             total_countries=pl.len(),
             countries=pl.col("country")
         )
-        .collect()
     )
 
 
-def calculate_base_stats(df: pl.LazyFrame) -> pl.DataFrame:
-    """Calculate base statistics for each indicator."""
+@profiled
+def calculate_base_stats(
+    df: pl.LazyFrame,
+    presence: "PresenceIndex | None" = None,
+    approx: bool = False
+) -> pl.DataFrame:
+    """
+    Calculate base statistics for each indicator.
+
+    With `approx=True`, the median, IQR and distinct counts are estimated from mergeable
+    sketches (`tools.sketch.StatsSketch`) instead of exact sorts and hash sets. The sketch
+    median is nearest-rank (the bucket holding the middle rank), while the exact median
+    averages the two middle values of an even count. With `presence`, the coverage
+    columns are read from its bitmaps; it is ignored unless it describes `df` itself
+    (coverage of a filtered subset needs the scan).
+    """
+    presence = _presence_for(df, presence)
+    if presence is None and not approx:
+        return collect(base_stats_plan(df))
+
+    keys = ["source", "collection", "indicator_label"]
+    schema = base_stats_plan(df).collect_schema()
+    if approx:
+        from tools.sketch import StatsSketch
+
+        stats = StatsSketch.build(df, distinct=presence is None).finalize()
+    else:
+        stats = collect(base_stats_plan(df, coverage=False))
+    if presence is not None:
+        stats = stats.join(
+            presence.coverage_stats(),
+            left_on=[pl.col(key).cast(pl.String) for key in keys],
+            right_on=keys,
+            how="left",
+            nulls_equal=True
+        )
+    return stats.select(schema.names()).cast(dict(schema))
+
+
+def base_stats_plan(
+    df: pl.LazyFrame,
+    extra_aggs: list[pl.Expr] | None = None,
+    coverage: bool = True
+) -> pl.LazyFrame:
+    """Lazy plan behind calculate_base_stats, optionally computing `extra_aggs` in the same group-by."""
+    coverage_aggs = [
+        pl.col("country").n_unique().alias("num_countries_with_data"),
+        pl.col("year").filter(pl.col("value").is_not_null()).n_unique().alias("num_years_with_data"),
+        # Temporal coverage
+        pl.col("year").filter(pl.col("value").is_not_null()).min().alias("min_year"),
+        pl.col("year").filter(pl.col("value").is_not_null()).max().alias("max_year"),
+    ]
     return (
         df
         .group_by("source","collection","indicator_label")
@@ -28,8 +157,7 @@ def calculate_base_stats(df: pl.LazyFrame) -> pl.DataFrame:
             # Counts and coverage
             pl.len().alias("count_rows"),
             pl.col("value").null_count().alias("count_missing_value"),
-            pl.col("country").n_unique().alias("num_countries_with_data"),
-            pl.col("year").filter(pl.col("value").is_not_null()).n_unique().alias("num_years_with_data"),
+            *(coverage_aggs[:2] if coverage else []),
             
             # Value statistics
             pl.col("value").mean().alias("mean_value"),
@@ -38,73 +166,351 @@ def calculate_base_stats(df: pl.LazyFrame) -> pl.DataFrame:
             pl.col("value").max().alias("max_value"),
             (pl.col("value").quantile(0.75) - pl.col("value").quantile(0.25)).alias("iqr_value"),
             
-            # Temporal coverage
-            pl.col("year").filter(pl.col("value").is_not_null()).min().alias("min_year"),
-            pl.col("year").filter(pl.col("value").is_not_null()).max().alias("max_year"),
+            *(coverage_aggs[2:] if coverage else []),
+            *(extra_aggs or []),
         ])
         .with_columns([
             (pl.col("count_missing_value") / pl.col("count_rows") * 100).alias("pct_missing_value")
         ])
         .sort("source","collection","indicator_label")
-        .collect()
     )
 
 
-def calculate_sub_region_coverage(df: pl.LazyFrame, sub_region_info: pl.DataFrame) -> pl.DataFrame:
-   """Calculate sub-region coverage percentages for each indicator."""
-   # Create lookup dict and regions list from sub_region_info
-   region_totals = dict(sub_region_info.select(["sub_region_name", "total_countries"]).rows())
-   regions = sub_region_info.get_column("sub_region_name").to_list()
-   
+@profiled
+def calculate_sub_region_coverage(
+   df: pl.LazyFrame,
+   sub_region_info: pl.DataFrame | GeographyIndex,
+   presence: "PresenceIndex | None" = None
+) -> pl.DataFrame:
+   """Calculate sub-region coverage percentages for each indicator (counted from `presence`, if it describes `df`)."""
+   presence = _presence_for(df, presence)
+   if presence is not None:
+       counts = presence.sub_region_counts(_as_geography_index(sub_region_info)).with_columns(
+           pl.col("indicator_label").cast(df.collect_schema()["indicator_label"])
+       )
+   else:
+       counts = collect(sub_region_counts_plan(df.filter(pl.col("value").is_not_null())))
+   return sub_region_coverage_from_counts(counts, sub_region_info)
+
+
+def sub_region_counts_plan(df: pl.LazyFrame) -> pl.LazyFrame:
+   """Lazy plan counting distinct countries per indicator and sub-region (callers filter out null values)."""
    return (
        df
-       .filter(pl.col("value").is_not_null())
+       .group_by(["indicator_label", "sub_region_name"])
+       .agg(pl.col("country").n_unique().alias("countries_with_data"))
+       # Sanitize the few aggregated names rather than every row (also works for Categorical)
+       .select(
+           "indicator_label",
+           pl.col("sub_region_name").cast(pl.String).str.replace_all(" ", "_").alias("sub_region_name_clean"),
+           "countries_with_data"
+       )
+   )
+
+
+def sub_region_coverage_from_counts(
+   counts: pl.DataFrame,
+   sub_region_info: pl.DataFrame | GeographyIndex
+) -> pl.DataFrame:
+   """Pivot collected sub-region counts into coverage percentages per indicator."""
+   # Totals, regions and column names come from the geography index
+   geo = _as_geography_index(sub_region_info)
+   pivoted = counts.pivot(on="sub_region_name_clean", index="indicator_label", values="countries_with_data")
+
+   return (
+       pivoted
+       # Sub-regions without data in `counts` (e.g. a filtered subset) have zero coverage
        .with_columns(
-           pl.col("sub_region_name").str.replace_all(" ", "_").alias("sub_region_name_clean")
+           pl.lit(0, pl.UInt32).alias(name)
+           for name in geo.column_names.values() if name not in pivoted.columns
        )
-       .group_by(["indicator_label", "sub_region_name_clean"])
-       .agg(pl.col("country").n_unique().alias("countries_with_data"))
-       .collect()
-       .pivot(on="sub_region_name_clean", index="indicator_label", values="countries_with_data")
        .fill_null(0)
        .with_columns([
-           (pl.col(region.replace(" ", "_")) / region_totals[region] * 100).round(3)
-           .alias(f"pct_coverage_{region.replace(' ', '_')}")
-           for region in regions
+           (pl.col(geo.column_names[region]) / geo.totals[region] * 100).round(3)
+           .alias(f"pct_coverage_{geo.column_names[region]}")
+           for region in geo.regions
        ])
-       .drop([region.replace(" ", "_") for region in regions])  # Keep only percentage columns
+       .drop(list(geo.column_names.values()))  # Keep only percentage columns
        .sort("indicator_label")
    )
 
 
-def style_sub_region_coverage_heatmap(coverage_df: pl.DataFrame):
-   """Apply heatmap styling to sub-region coverage DataFrame."""
+@profiled
+def calculate_coverage(df: pl.LazyFrame, dimensions: list[str]) -> pl.DataFrame:
+   """
+   Calculate country coverage percentages for each indicator across several country dimensions.
+
+   One group-by over country collects each country's attributes and the indicators it has
+   data for; that (indicator, country) presence table is then reused for every dimension,
+   so the data is scanned once however many dimensions are asked for.
+
+   Parameters
+   ----------
+   df : pl.LazyFrame
+       LazyFrame containing nexus data
+   dimensions : list[str]
+       Country-level columns, e.g. config.yaml's country_classification_columns
+
+   Returns
+   -------
+   pl.DataFrame
+       Tidy table with one row per (indicator_label, dimension, group): countries_with_data,
+       total_countries and pct_coverage. Countries whose dimension value is null are not counted.
+   """
+   countries = (
+       df
+       .filter(pl.col("country").is_not_null())
+       .group_by("country")
+       .agg([
+           *[pl.col(dim).drop_nulls().first().cast(pl.String) for dim in dimensions],
+           pl.col("indicator_label").filter(pl.col("value").is_not_null()).unique().alias("indicators"),
+       ])
+       .pipe(collect)
+   )
+   presence = countries.explode("indicators").rename({"indicators": "indicator_label"}).drop_nulls("indicator_label")
+   indicators = presence.select(pl.col("indicator_label").unique())
+
+   coverage = []
+   for dim in dimensions:
+       totals = (
+           countries
+           .filter(pl.col(dim).is_not_null())
+           .group_by(dim)
+           .agg(pl.len().alias("total_countries"))
+       )
+       counts = (
+           presence
+           .filter(pl.col(dim).is_not_null())
+           .group_by("indicator_label", dim)
+           .agg(pl.col("country").n_unique().alias("countries_with_data"))
+       )
+       coverage.append(
+           indicators
+           .join(totals, how="cross")   # keep zero-coverage groups
+           .join(counts, on=["indicator_label", dim], how="left")
+           .select(
+               "indicator_label",
+               pl.lit(dim).alias("dimension"),
+               pl.col(dim).alias("group"),
+               pl.col("countries_with_data").fill_null(0),
+               "total_countries",
+               (pl.col("countries_with_data").fill_null(0) / pl.col("total_countries") * 100)
+               .round(3)
+               .alias("pct_coverage"),
+           )
+       )
+
+   return (
+       pl.concat(coverage)
+       .sort("indicator_label", "dimension", "group")
+   )
+
+
+def indicators_metadata_plan(df: pl.LazyFrame, with_geography: bool = True) -> pl.LazyFrame:
+   """
+   Lazy plan for base statistics plus each indicator's distinct (country, sub_region_name) pairs.
+
+   The pairs of all rows ('geography') are only needed to build the sub-region info,
+   so they can be left out when a GeographyIndex is at hand.
+   """
+   geography = pl.struct("country", "sub_region_name")
+   return base_stats_plan(df, extra_aggs=[
+       *([geography.unique().alias("geography")] if with_geography else []),
+       geography.filter(pl.col("value").is_not_null()).unique().alias("geography_with_data"),
+   ])
+
+
+@profiled
+def create_indicators_metadata(
+   df: pl.LazyFrame,
+   geo: GeographyIndex | None = None,
+   presence: "PresenceIndex | None" = None
+) -> pl.DataFrame:
+   """
+   Create comprehensive metadata table for indicators in nexus dataset.
+
+   Everything is computed from a single group-by over (source, collection, indicator_label):
+   next to the base statistics it keeps each indicator's distinct (country, sub_region_name)
+   pairs, from which the sub-region info and coverage are derived. The data is scanned once.
+
+   With a presence index, the temporal and geographic coverage come from its bitmaps and
+   the scan only computes the value statistics.
+
+   Parameters
+   ----------
+   df : pl.LazyFrame
+       LazyFrame containing nexus data
+   geo : GeographyIndex, optional
+       Precomputed sub-region info; built from `df` in the same scan if not given
+   presence : PresenceIndex, optional
+       Presence bitmaps of the same data, e.g. `tools.PresenceIndex.open(df, nexus_path)`;
+       ignored if they were built for another frame, such as the unfiltered one
+
+   Returns
+   -------
+   pl.DataFrame
+       Metadata table with one row per indicator
+   """
+
+   presence = _presence_for(df, presence)
+   if presence is not None:
+       geo = geo if geo is not None else GeographyIndex.from_sub_region_info(get_sub_region_info(df))
+       base_stats = calculate_base_stats(df, presence)
+       sub_region_counts = presence.sub_region_counts(geo).with_columns(
+           pl.col("indicator_label").cast(base_stats.schema["indicator_label"])
+       )
+       return indicators_metadata_from_parts(base_stats, sub_region_counts, geo)
+
+   # Single scan: base statistics plus the geography each indicator touches
+   stats = collect(indicators_metadata_plan(df, with_geography=geo is None))
+   base_stats = stats.drop("geography", "geography_with_data", strict=False)
+
+   # Get sub-region information from every (country, sub-region) pair seen
+   if geo is None:
+       geo = GeographyIndex.from_sub_region_info(sub_region_info_plan(
+           stats.lazy().select(pl.col("geography").explode().struct.unnest())
+       ).pipe(collect))
+
+   # Count countries with data per indicator and sub-region
+   sub_region_counts = sub_region_counts_plan(
+       stats.lazy()
+       .select("indicator_label", "geography_with_data")
+       .filter(pl.col("geography_with_data").list.len() > 0)
+       .explode("geography_with_data")
+       .unnest("geography_with_data")
+   ).pipe(collect)
+
+   return indicators_metadata_from_parts(base_stats, sub_region_counts, geo)
+
+
+def indicators_metadata_from_parts(
+   base_stats: pl.DataFrame,
+   sub_region_counts: pl.DataFrame,
+   sub_region_info: pl.DataFrame | GeographyIndex
+) -> pl.DataFrame:
+   """Assemble the indicators metadata table from base stats, sub-region counts and sub-region info."""
+
+   def calculate_temporal_completeness() -> pl.Expr:
+       """Calculate temporal completeness expression."""
+       return (
+           pl.col("num_years_with_data") / (pl.col("max_year") - pl.col("min_year") + 1) * 100
+       ).fill_null(0)
+
+   def calculate_geographic_completeness(geo: GeographyIndex) -> pl.Expr:
+       """Calculate geographic completeness expression."""
+       return pl.concat_list([
+           pl.col(f"pct_coverage_{column}") for column in geo.column_names.values()
+       ]).list.mean()
+
+   geo = _as_geography_index(sub_region_info)
+
+   # Calculate sub-region coverage percentages (returns raw DataFrame, not styled)
+   sub_region_coverage = sub_region_coverage_from_counts(sub_region_counts, geo)
+
+   # Calculate completeness components
+   temporal_completeness = calculate_temporal_completeness()
+   geographic_completeness = calculate_geographic_completeness(geo)
+
+   # Calculate final metrics with completeness score
+   return (
+       base_stats
+       .join(sub_region_coverage, on="indicator_label", how="left")
+       .with_columns([
+           ((temporal_completeness + geographic_completeness) / 2).alias("completeness_score")
+       ])
+       .sort("completeness_score", descending=True)
+   )
+
+
+def _presence_for(df: pl.LazyFrame, presence: "PresenceIndex | None") -> "PresenceIndex | None":
+   """`presence` if its bitmaps describe `df`, otherwise None (coverage is then scanned)."""
+   return presence if presence is not None and presence.describes(df) else None
+
+
+def _as_geography_index(sub_region_info: pl.DataFrame | GeographyIndex) -> GeographyIndex:
+   """Accept either a `get_sub_region_info` table or a GeographyIndex."""
+   if isinstance(sub_region_info, GeographyIndex):
+       return sub_region_info
+   return GeographyIndex.from_sub_region_info(sub_region_info)
+
+
+# Heatmap colors are precomputed at 0.1% steps for the vectorized styling mode
+HEATMAP_LUT_SIZE = 1001
+
+
+def heatmap_cell_style(value: float) -> dict:
+   """Style a coverage percentage with a simple red-green gradient through bright yellow."""
+   if value <= 50:
+       # Red to bright yellow (0-50%)
+       red = 255
+       green = int(195 * (value / 50))  # 195 from #ffc300
+       blue = 0
+   else:
+       # Bright yellow to green (50-100%)
+       red = int(255 * (1 - (value - 50) / 50))
+       green = int(195 + 60 * ((value - 50) / 50))  # 195 to 255
+       blue = 0
+
+   return {
+       "backgroundColor": f"rgb({red}, {green}, {blue})",
+       "color": "black",
+       "fontWeight": "bold"
+   }
+
+
+def style_sub_region_coverage_heatmap(coverage_df: pl.DataFrame, vectorized: bool = False):
+   """
+   Apply heatmap styling to sub-region coverage DataFrame.
+
+   With `vectorized=True`, every cell's color is resolved up front: Polars maps the distinct
+   `pct_coverage_*` values to indices into a fixed-size color lookup table in one pass,
+   and the table's callback only looks styles up by value, with no per-cell arithmetic.
+   """
    import marimo as mo
    
    def style_cell(row_id, column_name, value):
        """Style cells with simple red-green gradient through bright yellow."""
        if column_name.startswith("pct_coverage_") and isinstance(value, (int, float)):
-           if value <= 50:
-               # Red to bright yellow (0-50%)
-               red = 255
-               green = int(195 * (value / 50))  # 195 from #ffc300
-               blue = 0
-           else:
-               # Bright yellow to green (50-100%)
-               red = int(255 * (1 - (value - 50) / 50))
-               green = int(195 + 60 * ((value - 50) / 50))  # 195 to 255
-               blue = 0
-           
-           return {
-               "backgroundColor": f"rgb({red}, {green}, {blue})",
-               "color": "black",
-               "fontWeight": "bold"
-           }
+           return heatmap_cell_style(value)
        return {}
+
+   if vectorized:
+       style_cell = _precomputed_heatmap_style(coverage_df)
    
    return mo.ui.table(
        data=coverage_df,
        style_cell=style_cell,
        pagination=True,
        label="Sub-Region Coverage Heatmap"
-   )
\ No newline at end of file
+   )
+
+
+def _precomputed_heatmap_style(coverage_df: pl.DataFrame):
+   """Build a style_cell lookup from a color LUT and the LUT index of every distinct coverage value."""
+   lut = [heatmap_cell_style(100 * i / (HEATMAP_LUT_SIZE - 1)) for i in range(HEATMAP_LUT_SIZE)]
+   columns = {
+       col for col, dtype in coverage_df.schema.items()
+       if col.startswith("pct_coverage_") and dtype.is_numeric()
+   }
+
+   # Keyed by value, not row position, so styles follow rows the table sorts or filters;
+   # NaN and null stay unstyled
+   values = (
+       pl.concat([coverage_df.get_column(col).cast(pl.Float64) for col in columns])
+       if columns else pl.Series(dtype=pl.Float64)
+   )
+   indices = (
+       values.fill_nan(None).drop_nulls().unique().to_frame("value")
+       .with_columns(
+           (pl.col("value").clip(0, 100) * (HEATMAP_LUT_SIZE - 1) / 100).floor().cast(pl.Int32).alias("index")
+       )
+   )
+   styles = {value: lut[index] for value, index in indices.iter_rows()}
+
+   def style_cell(row_id, column_name, value):
+       """Look the precomputed style up."""
+       if column_name not in columns:
+           return {}
+       return styles.get(value, {})
+
+   return style_cell